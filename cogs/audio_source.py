@@ -6,13 +6,23 @@ Handles YouTube video extraction and audio source creation for Discord.
 
 import discord
 import asyncio
+import functools
+import logging
 from typing import Optional, Dict, Any
 
 from .config import (
-    create_ytdl_instance,
+    DEFAULT_VOLUME,
+    FFMPEG_BEFORE_OPTIONS,
+    FFMPEG_OPTIONS,
     logger
 )
 
+# Cached once at import so the per-track debug path costs a single check
+_debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+# Discord markdown characters escaped by sanitize_title (single pass)
+_MD_TABLE = str.maketrans({c: '\\' + c for c in '*_~`|><[]()'})
+
 
 class YTDLSource(discord.PCMVolumeTransformer):
     """
@@ -34,7 +44,7 @@ class YTDLSource(discord.PCMVolumeTransformer):
         source: discord.AudioSource,
         *,
         data: Dict[str, Any],
-        volume: float = 0.5
+        volume: float = DEFAULT_VOLUME
     ):
         """
         Initialize YTDLSource with audio source and metadata.
@@ -56,19 +66,22 @@ class YTDLSource(discord.PCMVolumeTransformer):
         cls,
         data: Dict[str, Any],
         *,
-        loop: Optional[asyncio.AbstractEventLoop] = None
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        volume: float = DEFAULT_VOLUME
     ):
         """
         Create a YTDLSource from already-extracted video data.
         
-        This avoids re-extracting and speeds up playback.
+        This avoids re-extracting and speeds up playback. At full volume
+        a YTDLOpusSource is returned instead, which needs no PCM work.
 
         Args:
             data: Already-extracted video data from yt-dlp
             loop: Event loop (not used but kept for compatibility)
+            volume: Playback volume (0.0 to 1.0)
 
         Returns:
-            YTDLSource instance ready for playback
+            YTDLSource (or YTDLOpusSource) instance ready for playback
 
         Raises:
             Exception: If audio source creation fails
@@ -82,26 +95,39 @@ class YTDLSource(discord.PCMVolumeTransformer):
                 f"Available keys: {list(data.keys())}"
             )
 
-        # #region agent log
-        import json
-        with open(r'c:\Users\Kevin\Desktop\Github\disco_bot\.cursor\debug.log', 'a', encoding='utf-8') as f:
-            f.write(json.dumps({'sessionId':'debug-session','runId':'post-fix','hypothesisId':'H1,H2','location':'audio_source.py:86','message':'Stream metadata (WORKING)','data':{'asr':data.get('asr'),'abr':data.get('abr'),'acodec':data.get('acodec'),'format_id':data.get('format_id'),'protocol':data.get('protocol'),'has_url_expire':('expire=' in filename)},'timestamp':__import__('time').time()*1000}) + '\n')
-        # #endregion
+        if _debug_enabled:
+            logger.debug(
+                "stream meta asr=%s abr=%s acodec=%s fmt=%s",
+                data.get('asr'), data.get('abr'),
+                data.get('acodec'), data.get('format_id')
+            )
 
         logger.info(f"Using audio source URL: {filename[:80]}...")
 
+        if volume >= 1.0:
+            # Opus streams are copied as-is; anything else is encoded to
+            # Opus by FFmpeg rather than by the voice thread
+            codec = 'copy' if data.get('acodec') == 'opus' else None
+            try:
+                return YTDLOpusSource(
+                    filename,
+                    data=data,
+                    codec=codec,
+                    before_options=FFMPEG_BEFORE_OPTIONS,
+                    options=FFMPEG_OPTIONS
+                )
+            except Exception as e:
+                logger.warning(f"Opus passthrough failed, using PCM: {e}")
+
         # Create FFmpeg audio source
         # Error code -22 (EINVAL) means invalid argument
-        # Use absolute minimal options - Discord.py handles most processing
+        # Use minimal options - Discord.py handles most processing
         try:
-            # Try with minimal reconnect options only
-            reconnect_opts = (
-                '-reconnect 1 -reconnect_streamed 1 '
-                '-reconnect_delay_max 5'
-            )
+            # Reconnect plus low-latency probing options
             audio_source = discord.FFmpegPCMAudio(
                 filename,
-                before_options=reconnect_opts
+                before_options=FFMPEG_BEFORE_OPTIONS,
+                options=FFMPEG_OPTIONS
             )
             logger.debug("FFmpeg created with reconnect options")
         except Exception as e:
@@ -116,58 +142,42 @@ class YTDLSource(discord.PCMVolumeTransformer):
                     f"Failed to create FFmpeg audio source: {e2}"
                 )
 
-        return cls(audio_source, data=data)
-
-    @classmethod
-    async def from_url(
-        cls,
-        url: str,
-        *,
-        loop: Optional[asyncio.AbstractEventLoop] = None,
-        stream: bool = False
-    ):
-        """
-        Create a YTDLSource from a YouTube URL or search query.
-        
-        NOTE: Prefer using from_data() with already-extracted data to avoid
-        double extraction.
-
-        Args:
-            url: YouTube URL or search query
-            loop: Event loop (uses default if None)
-            stream: Whether to stream audio (True) or download first (False)
-
-        Returns:
-            YTDLSource instance ready for playback
+        return cls(audio_source, data=data, volume=volume)
 
-        Raises:
-            Exception: If video extraction or audio source creation fails
-        """
-        # Get loop safely
-        if loop is None:
-            try:
-                loop = asyncio.get_running_loop()
-            except RuntimeError:
-                loop = asyncio.get_event_loop()
 
-        # Create fresh ytdl instance for thread safety
-        ytdl = create_ytdl_instance()
+class YTDLOpusSource(discord.FFmpegOpusAudio):
+    """
+    YouTube audio source that sends Opus packets straight from FFmpeg.
 
-        def extract_func():
-            """Extract video info using yt-dlp."""
-            return ytdl.extract_info(url, download=not stream)
+    Used at 100% volume, where PCMVolumeTransformer would only decode,
+    scale by 1.0 and re-encode every frame. Its volume cannot be changed.
 
-        # Run extraction in executor to avoid blocking
-        data = await loop.run_in_executor(None, extract_func)
+    Attributes:
+        data (dict): Video metadata from yt-dlp
+        title (str): Video title
+        url (str): Video URL
+        duration (int): Video duration in seconds
+        thumbnail (str): Thumbnail URL
+    """
 
-        # Handle playlists or search results (take first entry)
-        if 'entries' in data:
-            data = data['entries'][0]
+    def __init__(self, source: str, *, data: Dict[str, Any], **kwargs):
+        """
+        Initialize YTDLOpusSource with a stream URL and metadata.
 
-        # Use from_data to create the source
-        return await cls.from_data(data, loop=loop)
+        Args:
+            source: Direct audio stream URL
+            data: Video metadata dictionary from yt-dlp
+            **kwargs: Passed through to FFmpegOpusAudio
+        """
+        super().__init__(source, **kwargs)
+        self.data = data
+        self.title = sanitize_title(data.get('title', 'Unknown'))
+        self.url = data.get('url', '')
+        self.duration = data.get('duration', 0)
+        self.thumbnail = data.get('thumbnail')
 
 
+@functools.lru_cache(maxsize=1024)
 def sanitize_title(title: str) -> str:
     """
     Sanitize song title to prevent Discord markdown injection.
@@ -184,9 +194,7 @@ def sanitize_title(title: str) -> str:
         return 'Unknown'
 
     # Escape Discord markdown characters
-    markdown_chars = ['*', '_', '~', '`', '|', '>', '<', '[', ']', '(', ')']
-    for char in markdown_chars:
-        title = title.replace(char, f'\\{char}')
+    title = title.translate(_MD_TABLE)
 
     # Limit title length to prevent embed issues
     max_length = 200
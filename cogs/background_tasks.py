@@ -4,128 +4,117 @@ Background tasks for the Music cog.
 Handles auto-disconnect functionality when bot is alone or inactive.
 """
 
-import discord
 import asyncio
 import time
 
 from .config import (
-    ALONE_CHECK_INTERVAL,
-    INACTIVITY_CHECK_INTERVAL,
     INACTIVITY_TIMEOUT,
+    INACTIVITY_TIMEOUT_NS,
+    WATCHDOG_INTERVAL,
     logger
 )
 
-
-async def check_alone(
-    get_voice_client,
-    get_state,
-    cleanup_callback
-) -> None:
-    """
-    Background task to check if bot is alone and auto-disconnect.
-
-    Checks every ALONE_CHECK_INTERVAL seconds. If bot is alone and
-    not playing/paused, disconnects after 1 minute.
-
-    Args:
-        get_voice_client: Function that returns current voice client
-        get_state: Function that returns (is_playing, is_paused) tuple
-        cleanup_callback: Function to call for cleanup
-    """
-    try:
-        while True:
-            await asyncio.sleep(ALONE_CHECK_INTERVAL)
-
-            voice_client = get_voice_client()
-            if voice_client and voice_client.channel:
-                # Count non-bot members
-                members = [
-                    m for m in voice_client.channel.members
-                    if not m.bot
-                ]
-
-                # If alone and not playing, disconnect
-                if len(members) == 0:
-                    is_playing, is_paused = get_state()
-                    if not is_playing and not is_paused:
-                        logger.info(
-                            "Bot is alone in voice channel, disconnecting"
-                        )
-                        await voice_client.disconnect()
-                        cleanup_callback()
-                        break
-    except asyncio.CancelledError:
-        logger.debug("check_alone task cancelled")
-    except Exception as e:
-        logger.error(f"Error in check_alone task: {e}")
+# Precomputed notice sent to the music channel on inactivity disconnect
+_TIMEOUT_MINS = INACTIVITY_TIMEOUT // 60
+_INACTIVITY_MSG = (
+    f"🔇 Disconnected due to inactivity "
+    f"({_TIMEOUT_MINS} minutes without commands)."
+)
 
 
-async def check_inactivity(
+async def watchdog(
     get_voice_client,
     get_last_activity,
+    activity_event,
     get_state,
-    get_allowed_channel_name,
-    bot,
+    get_allowed_channel,
     cleanup_callback
 ) -> None:
     """
-    Background task to disconnect after inactivity timeout.
+    Background task to auto-disconnect when alone or inactive.
 
-    Checks every INACTIVITY_CHECK_INTERVAL seconds. If no commands
-    have been used for INACTIVITY_TIMEOUT seconds and bot is not playing,
-    disconnects and notifies in the music channel.
+    Wakes every WATCHDOG_INTERVAL seconds, or exactly at the inactivity
+    deadline if that comes sooner, and runs both checks against a single
+    voice client read. Command activity (activity_event) wakes it early
+    to recompute the deadline. While playing or paused nothing happens.
+    Otherwise the bot disconnects if it is alone in the channel, or if no
+    commands have been used for INACTIVITY_TIMEOUT seconds (notifying in
+    the music channel in that case).
 
     Args:
         get_voice_client: Function that returns current voice client
         get_last_activity: Function that returns last activity timestamp
+            (time.monotonic_ns())
+        activity_event: asyncio.Event set whenever activity is recorded
         get_state: Function that returns (is_playing, is_paused) tuple
-        get_allowed_channel_name: Function that returns allowed channel name
-        bot: Bot instance for sending messages
+        get_allowed_channel: Function that takes a guild and returns the
+            allowed channel (or None)
         cleanup_callback: Function to call for cleanup
     """
     try:
         while True:
-            await asyncio.sleep(INACTIVITY_CHECK_INTERVAL)
+            # Sleep until the next alone check or the inactivity deadline,
+            # whichever is sooner
+            timeout = WATCHDOG_INTERVAL
+            last_activity = get_last_activity()
+            if last_activity:
+                remaining_ns = (
+                    last_activity + INACTIVITY_TIMEOUT_NS - time.monotonic_ns()
+                )
+                if remaining_ns > 0:
+                    timeout = min(timeout, remaining_ns / 1_000_000_000)
+
+            try:
+                await asyncio.wait_for(activity_event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                # Activity was just recorded; recompute the deadline
+                activity_event.clear()
+                continue
 
             voice_client = get_voice_client()
+            if not voice_client:
+                continue
+
+            is_playing, is_paused = get_state()
+            if is_playing or is_paused:
+                continue
+
+            # If alone (no non-bot members), disconnect
+            if voice_client.channel and not any(
+                not m.bot for m in voice_client.channel.members
+            ):
+                logger.info("Bot is alone in voice channel, disconnecting")
+                await voice_client.disconnect()
+                cleanup_callback()
+                break
+
+            # If inactive, disconnect and notify
             last_activity = get_last_activity()
-
-            if voice_client and last_activity:
-                # Use time.monotonic() instead of deprecated loop.time()
-                time_since_activity = time.monotonic() - last_activity
-
-                # If inactive and not playing, disconnect
-                if time_since_activity > INACTIVITY_TIMEOUT:
-                    is_playing, is_paused = get_state()
-                    if not is_playing and not is_paused:
-                        logger.info(
-                            f"Bot inactive for {INACTIVITY_TIMEOUT}s, "
-                            "disconnecting"
-                        )
-                        await voice_client.disconnect()
-                        cleanup_callback()
-
-                        # Try to notify in music channel
-                        try:
-                            # Get current channel name (may have changed)
-                            channel_name = get_allowed_channel_name()
-                            channel = discord.utils.get(
-                                bot.get_all_channels(),
-                                name=channel_name
-                            )
-                            if channel:
-                                timeout_mins = INACTIVITY_TIMEOUT // 60
-                                await channel.send(
-                                    f"🔇 Disconnected due to inactivity "
-                                    f"({timeout_mins} minutes "
-                                    f"without commands)."
-                                )
-                        except Exception as e:
-                            logger.warning(
-                                f"Could not send inactivity message: {e}"
-                            )
-                        break
+            if not last_activity:
+                continue
+
+            # Integer nanosecond delta against a precomputed timeout
+            if time.monotonic_ns() - last_activity > INACTIVITY_TIMEOUT_NS:
+                logger.info(
+                    f"Bot inactive for {INACTIVITY_TIMEOUT}s, disconnecting"
+                )
+                guild = voice_client.guild
+                await voice_client.disconnect()
+                cleanup_callback()
+
+                # Try to notify in music channel
+                try:
+                    channel = get_allowed_channel(guild)
+                    if channel:
+                        await channel.send(_INACTIVITY_MSG)
+                except Exception as e:
+                    logger.warning(
+                        f"Could not send inactivity message: {e}"
+                    )
+                break
     except asyncio.CancelledError:
-        logger.debug("check_inactivity task cancelled")
+        logger.debug("watchdog task cancelled")
     except Exception as e:
-        logger.error(f"Error in check_inactivity task: {e}")
+        logger.error(f"Error in watchdog task: {e}")
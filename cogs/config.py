@@ -4,8 +4,17 @@ Configuration constants for the Music cog.
 Contains all configuration values, timing constants, and yt-dlp settings.
 """
 
+import atexit
+import importlib.util
 import logging
-import yt_dlp
+import logging.handlers
+import multiprocessing
+import os
+import queue
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    import yt_dlp
 
 
 # ============================================================================
@@ -26,11 +35,40 @@ if not logger.handlers:
     handler.setFormatter(formatter)
     logger.addHandler(handler)
 
+    # Optional debug file log (set MUSIC_DEBUG_LOG to a file path).
+    # Records go through a QueueHandler so disk writes happen on the
+    # listener's background thread instead of the event loop. Only the
+    # bot process writes the file: extractor workers also import this
+    # module, and atexit hooks do not run in multiprocessing children.
+    _debug_log_path = os.getenv('MUSIC_DEBUG_LOG')
+    if _debug_log_path and multiprocessing.parent_process() is None:
+        logger.setLevel(logging.DEBUG)
+        _log_queue: queue.Queue = queue.Queue(-1)
+        _file_handler = logging.FileHandler(
+            _debug_log_path, encoding='utf-8'
+        )
+        _file_handler.setFormatter(formatter)
+        logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+        _log_listener = logging.handlers.QueueListener(
+            _log_queue, _file_handler
+        )
+        _log_listener.start()
+        # Flush records still queued when the interpreter exits
+        atexit.register(_log_listener.stop)
+
 
 # ============================================================================
 # YT-DLP CONFIGURATION
 # ============================================================================
 
+# Advertise Brotli (smaller responses than gzip) only when yt-dlp has a
+# brotli/brotlicffi module to decode it with. Probed without importing so
+# yt-dlp itself stays unloaded until the first extraction.
+_HAS_BROTLI = any(
+    importlib.util.find_spec(name) for name in ('brotli', 'brotlicffi')
+)
+ACCEPT_ENCODING = 'br, gzip, deflate' if _HAS_BROTLI else 'gzip, deflate'
+
 # yt-dlp configuration for audio extraction
 # Enhanced anti-bot detection settings for hosted environments
 YTDL_FORMAT_OPTIONS = {
@@ -54,7 +92,7 @@ YTDL_FORMAT_OPTIONS = {
     'http_headers': {
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
         'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate',
+        'Accept-Encoding': ACCEPT_ENCODING,
         'DNT': '1',
         'Connection': 'keep-alive',
         'Upgrade-Insecure-Requests': '1',
@@ -72,22 +110,77 @@ YTDL_FORMAT_OPTIONS = {
     },
 }
 
-# Suppress yt-dlp warnings
-# Accept any arguments to avoid breaking yt-dlp's internal calls
-yt_dlp.utils.bug_reports_message = lambda *args, **kwargs: ''
+# Streaming-only options used by all current code paths. Nothing is
+# written to disk, so skip the output template and file-writing branches.
+YTDL_STREAM_OPTIONS = {
+    key: value for key, value in YTDL_FORMAT_OPTIONS.items()
+    if key not in ('outtmpl', 'restrictfilenames')
+}
+YTDL_STREAM_OPTIONS.update({
+    'skip_download': True,
+    'simulate': True,
+    'writeinfojson': False,
+    'writethumbnail': False,
+    'writesubtitles': False,
+})
+
+# Flat playlist extraction: list entries without resolving each video
+YTDL_FLAT_OPTIONS = {
+    **YTDL_STREAM_OPTIONS,
+    'extract_flat': 'in_playlist',
+}
+
 
+def _load_yt_dlp():
+    """
+    Import yt-dlp on first use.
 
-def create_ytdl_instance():
+    yt-dlp is slow to import, so loading it here instead of at module
+    import keeps cog startup and reloads fast.
+    """
+    import yt_dlp
+
+    # Suppress yt-dlp warnings
+    # Accept any arguments to avoid breaking yt-dlp's internal calls
+    yt_dlp.utils.bug_reports_message = lambda *args, **kwargs: ''
+    return yt_dlp
+
+
+def create_ytdl_instance(
+    options: Optional[Dict[str, Any]] = None
+) -> 'yt_dlp.YoutubeDL':
     """
     Create a new yt-dlp instance.
 
     Returns a fresh instance to avoid state issues in multi-guild scenarios.
+
+    Args:
+        options: yt-dlp options (defaults to YTDL_STREAM_OPTIONS)
     """
-    return yt_dlp.YoutubeDL(YTDL_FORMAT_OPTIONS)
+    return _load_yt_dlp().YoutubeDL(options or YTDL_STREAM_OPTIONS)
 
 
-# Default instance for backwards compatibility
-ytdl = create_ytdl_instance()
+# ============================================================================
+# EXTRACTION CACHE
+# ============================================================================
+
+# How long extracted metadata stays valid (seconds). Stream URLs expire
+# well before YouTube's ~6h signature lifetime, so keep this short.
+EXTRACT_CACHE_TTL = 300
+
+# Upper bound on cached extractions before old entries are evicted
+EXTRACT_CACHE_MAX_ENTRIES = 256
+
+# yt-dlp worker processes. Two let !play overlap one background
+# resolution. Each spawned worker imports discord.py and yt-dlp (~60 MB
+# RSS before any extraction), so keep this low on small hosts.
+EXTRACTOR_WORKERS = 2
+
+# Queue entries ahead of playback whose metadata is resolved in advance
+PREFETCH_DEPTH = 2
+
+# Maximum concurrent background resolutions of queued entries
+RESOLVE_CONCURRENCY = 4
 
 
 # ============================================================================
@@ -95,24 +188,28 @@ ytdl = create_ytdl_instance()
 # ============================================================================
 
 # FFmpeg options for smooth audio playback
-# before_options: Connection and buffering settings
+# before_options: Reconnect settings plus low-latency input flags. A small
+# probesize and zero analyzeduration skip ffmpeg's multi-second input
+# analysis before the first frame; 32k still covers webm/m4a headers.
+# -nostdin stops ffmpeg polling stdin for interactive commands.
 FFMPEG_BEFORE_OPTIONS = (
-    '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5 '
-    '-bufsize 512k -fflags +genpts'
+    '-nostdin -reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5 '
+    '-fflags nobuffer -flags low_delay -probesize 32k -analyzeduration 0'
 )
 
-# options: Audio processing settings (PCM output for Discord)
-# Simplified: removed audio filter that might cause issues
-FFMPEG_OPTIONS = '-vn -f s16le -ar 48000 -ac 2'
+# Initial playback volume (0.0 to 1.0). At exactly 1.0 audio is sent as
+# Opus straight from FFmpeg, skipping PCM volume scaling and re-encoding.
+DEFAULT_VOLUME = 0.5
+
+# options: Output settings appended after discord.py's own PCM flags
+# (-f s16le -ar 48000 -ac 2); -vn skips any video stream in the input
+FFMPEG_OPTIONS = '-vn'
 
 
 # ============================================================================
 # TIMING CONSTANTS
 # ============================================================================
 
-# Delay before playback to ensure buffer readiness (reduces stuttering)
-BUFFER_DELAY_SECONDS = 0.2
-
 # Delay after connecting to voice channel for stability
 CONNECTION_STABILIZE_DELAY = 1.0
 
@@ -125,6 +222,15 @@ INACTIVITY_CHECK_INTERVAL = 60
 # Timeout before disconnecting due to inactivity (seconds = 15 minutes)
 INACTIVITY_TIMEOUT = 900
 
+# Inactivity timeout in nanoseconds, for comparing monotonic_ns() stamps
+INACTIVITY_TIMEOUT_NS = INACTIVITY_TIMEOUT * 1_000_000_000
+
+# Activity updates closer together than this are coalesced (nanoseconds)
+ACTIVITY_COALESCE_NS = 1_000_000_000
+
+# Wake interval for the combined alone/inactivity watchdog (seconds)
+WATCHDOG_INTERVAL = min(ALONE_CHECK_INTERVAL, INACTIVITY_CHECK_INTERVAL)
+
 
 # ============================================================================
 # RATE LIMITING
@@ -134,6 +240,10 @@ INACTIVITY_TIMEOUT = 900
 COMMAND_RATE = 2
 COMMAND_PER_SECONDS = 5
 
+# Identical canned error replies in a channel are sent at most once per
+# this many seconds
+MESSAGE_THROTTLE_SECONDS = 1.0
+
 
 # ============================================================================
 # DISPLAY CONSTANTS
@@ -142,6 +252,9 @@ COMMAND_PER_SECONDS = 5
 # Maximum songs to show in queue embed
 MAX_QUEUE_DISPLAY = 10
 
+# Maximum songs held in a guild's queue
+MAX_QUEUE_SIZE = 500
+
 # Default channel name for command restriction
 DEFAULT_ALLOWED_CHANNEL = 'music'
 
@@ -8,9 +8,92 @@ import asyncio
 import time
 import discord
 from collections import deque
-from typing import Optional, Dict, Any, Set
+from itertools import islice
+from typing import Optional, Dict, Any, Tuple
 
-from .config import DEFAULT_ALLOWED_CHANNEL
+from .config import (
+    ACTIVITY_COALESCE_NS,
+    DEFAULT_ALLOWED_CHANNEL,
+    DEFAULT_VOLUME,
+    MAX_QUEUE_DISPLAY,
+    MAX_QUEUE_SIZE,
+    MESSAGE_THROTTLE_SECONDS
+)
+
+
+class VersionedDeque(deque):
+    """
+    deque that counts its mutations.
+
+    Cached views of the queue (display snapshot, queue embed) compare
+    against `version` to know when they are stale, without every caller
+    having to invalidate them by hand.
+    """
+
+    # Keeps the subclass as lean as a plain deque (no per-queue __dict__)
+    __slots__ = ('version',)
+
+    def __init__(self, iterable=(), maxlen: Optional[int] = None):
+        super().__init__(iterable, maxlen)
+        self.version: int = 0
+
+    def append(self, item) -> None:
+        super().append(item)
+        self.version += 1
+
+    def appendleft(self, item) -> None:
+        super().appendleft(item)
+        self.version += 1
+
+    def extend(self, iterable) -> None:
+        super().extend(iterable)
+        self.version += 1
+
+    def extendleft(self, iterable) -> None:
+        super().extendleft(iterable)
+        self.version += 1
+
+    def insert(self, index: int, item) -> None:
+        super().insert(index, item)
+        self.version += 1
+
+    def pop(self):
+        item = super().pop()
+        self.version += 1
+        return item
+
+    def popleft(self):
+        item = super().popleft()
+        self.version += 1
+        return item
+
+    def remove(self, item) -> None:
+        super().remove(item)
+        self.version += 1
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+
+    def rotate(self, n: int = 1) -> None:
+        super().rotate(n)
+        self.version += 1
+
+    def reverse(self) -> None:
+        super().reverse()
+        self.version += 1
+
+    def __setitem__(self, index, item) -> None:
+        super().__setitem__(index, item)
+        self.version += 1
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self.version += 1
+
+    def __iadd__(self, iterable):
+        self.extend(iterable)
+        return self
 
 
 class GuildMusicState:
@@ -21,59 +104,248 @@ class GuildMusicState:
 
     Attributes:
         guild_id: Discord guild ID
-        queue: Song queue (deque)
+        queue: Song queue (VersionedDeque bounded to max_queue entries)
         current_song: Currently playing song info
         is_playing: Whether audio is playing
         is_paused: Whether playback is paused
         voice_client: Voice channel connection
-        skip_votes: Set of user IDs who voted to skip
-        last_activity: Timestamp of last command usage
+        volume: Playback volume (0.0 to 1.0) applied to each new song
+        watchdog_task: Auto-disconnect background task
+        last_activity: time.monotonic_ns() of last command usage
+        activity_event: Set on each activity update to wake the watchdog
         allowed_channel_name: Channel where commands are allowed
+        allowed_channel_id: Cached ID of the allowed channel, if resolved
         play_retry_count: Counter for play_next retries
+        prefetch_slot: Task building the next song's audio source
+        prefetch_song: Queue entry the prefetch_slot task is building
+        cooldowns: (command, user ID) -> (window end, uses) of each
+            active cooldown window
+        message_times: (channel ID, message) -> monotonic time last sent
+        queue_embed_cache: (queue version, current song, embed) of the
+            last rendered queue embed
     """
 
-    def __init__(self, guild_id: int):
+    # One instance per guild, read on every command and watchdog tick
+    __slots__ = (
+        'guild_id',
+        'queue',
+        'current_song',
+        'is_playing',
+        'is_paused',
+        'voice_client',
+        'volume',
+        'watchdog_task',
+        'last_activity',
+        'activity_event',
+        'allowed_channel_name',
+        'allowed_channel_id',
+        'play_retry_count',
+        'prefetch_slot',
+        'prefetch_song',
+        '_display_cache',
+        'queue_embed_cache',
+        'cooldowns',
+        'message_times',
+    )
+
+    def __init__(self, guild_id: int, max_queue: int = MAX_QUEUE_SIZE):
         """
         Initialize guild state.
 
         Args:
             guild_id: Discord guild ID
+            max_queue: Maximum number of songs the queue can hold
         """
         self.guild_id = guild_id
-        self.queue: deque = deque()
+        self.queue: VersionedDeque = VersionedDeque(maxlen=max_queue)
         self.current_song: Optional[Dict[str, Any]] = None
         self.is_playing: bool = False
         self.is_paused: bool = False
         self.voice_client: Optional[discord.VoiceClient] = None
-        self.skip_votes: Set[int] = set()
-        self.alone_check_task: Optional[asyncio.Task] = None
-        self.inactivity_timer: Optional[asyncio.Task] = None
-        self.last_activity: Optional[float] = None
+        self.volume: float = DEFAULT_VOLUME
+        self.watchdog_task: Optional[asyncio.Task] = None
+        self.last_activity: Optional[int] = None
+        self.activity_event: asyncio.Event = asyncio.Event()
         self.allowed_channel_name: str = DEFAULT_ALLOWED_CHANNEL
+        self.allowed_channel_id: Optional[int] = None
         self.play_retry_count: int = 0
+        self.prefetch_slot: Optional[asyncio.Task] = None
+        self.prefetch_song: Optional[Dict[str, Any]] = None
+        self._display_cache: Optional[
+            Tuple[int, Tuple[Dict[str, Any], ...]]
+        ] = None
+        self.queue_embed_cache: Optional[
+            Tuple[int, Optional[Dict[str, Any]], discord.Embed]
+        ] = None
+        self.cooldowns: Dict[Tuple[str, int], Tuple[float, int]] = {}
+        self.message_times: Dict[Tuple[int, str], float] = {}
+
+    def is_queue_full(self) -> bool:
+        """Return True if no more songs can be queued."""
+        return len(self.queue) >= self.queue.maxlen
+
+    @property
+    def queue_version(self) -> int:
+        """Mutation counter of the queue; changes whenever it is modified."""
+        return self.queue.version
+
+    def display_queue(self) -> Tuple[Dict[str, Any], ...]:
+        """
+        Get the first MAX_QUEUE_DISPLAY queued songs for display.
+
+        The snapshot is cached until the queue is next modified.
+        """
+        version = self.queue.version
+        cached = self._display_cache
+        if cached is None or cached[0] != version:
+            cached = (version, tuple(islice(self.queue, MAX_QUEUE_DISPLAY)))
+            self._display_cache = cached
+        return cached[1]
+
+    def get_voice_client(self) -> Optional[discord.VoiceClient]:
+        """Return the current voice client."""
+        return self.voice_client
+
+    def get_state_tuple(self) -> Tuple[bool, bool]:
+        """Return (is_playing, is_paused)."""
+        return (self.is_playing, self.is_paused)
+
+    def get_last_activity(self) -> Optional[int]:
+        """Return the last activity timestamp (monotonic nanoseconds)."""
+        return self.last_activity
+
+    def check_cooldown(
+        self,
+        key: Tuple[str, int],
+        rate: int,
+        per: float
+    ) -> float:
+        """
+        Record one use of a rate-limited command.
+
+        Allows `rate` uses per `per`-second window, starting the window
+        on the first use (same semantics as discord.py cooldowns).
+        Finished windows are pruned on each call, so only users with an
+        active window are kept.
+
+        Args:
+            key: (command name, user ID) pair
+            rate: Uses allowed per window
+            per: Window length in seconds
+
+        Returns:
+            0.0 if the use is allowed, otherwise seconds until retry
+        """
+        now = time.monotonic()
+        cooldowns = self.cooldowns
+        # Same pruning as discord.py's CooldownMapping cache
+        expired = [
+            k for k, (window_end, _) in cooldowns.items()
+            if window_end <= now
+        ]
+        for k in expired:
+            del cooldowns[k]
+
+        window_end, uses = cooldowns.get(key, (now + per, 0))
+        if uses >= rate:
+            return window_end - now
+        cooldowns[key] = (window_end, uses + 1)
+        return 0.0
+
+    def should_send(self, channel_id: int, message: str) -> bool:
+        """
+        Check whether a canned message may be sent to a channel again.
+
+        Records the send when allowed, so identical messages within
+        MESSAGE_THROTTLE_SECONDS of each other are dropped.
+
+        Args:
+            channel_id: Destination channel ID
+            message: Message text
+
+        Returns:
+            True if the message should be sent
+        """
+        now = time.monotonic()
+        key = (channel_id, message)
+        last = self.message_times.get(key)
+        if last is not None and now - last < MESSAGE_THROTTLE_SECONDS:
+            return False
+        self.message_times[key] = now
+        return True
 
     def update_activity(self) -> None:
-        """Update the last activity timestamp to current time."""
-        self.last_activity = time.monotonic()
+        """
+        Update the last activity timestamp (monotonic nanoseconds).
+
+        Bursts of commands within ACTIVITY_COALESCE_NS of the last update
+        are skipped; the inactivity timeout only needs second precision.
+        """
+        now = time.monotonic_ns()
+        last = self.last_activity
+        if last is not None and now - last < ACTIVITY_COALESCE_NS:
+            return
+        self.last_activity = now
+        self.activity_event.set()
+
+    def get_allowed_channel(
+        self,
+        guild: discord.Guild
+    ) -> Optional[discord.abc.GuildChannel]:
+        """
+        Resolve the allowed channel in guild, caching its ID.
+
+        Uses the cached ID when it is still valid and only falls back to
+        scanning the guild's text channels by name when it is not.
+
+        Args:
+            guild: Guild this state belongs to
+
+        Returns:
+            The allowed channel, or None if it cannot be found
+        """
+        if self.allowed_channel_id is not None:
+            channel = guild.get_channel(self.allowed_channel_id)
+            if channel is not None:
+                return channel
+
+        channel = discord.utils.get(
+            guild.text_channels,
+            name=self.allowed_channel_name
+        )
+        self.allowed_channel_id = channel.id if channel else None
+        return channel
 
     def cleanup(self) -> None:
         """Reset all voice-related state variables."""
+        self.voice_client = None
         self.queue.clear()
         self.is_playing = False
         self.is_paused = False
         self.current_song = None
-        self.skip_votes.clear()
         self.last_activity = None
         self.play_retry_count = 0
+        self.cooldowns.clear()
+        self.cancel_prefetch()
+
+    def cancel_prefetch(self) -> None:
+        """Cancel any in-flight prefetch and release a prebuilt source."""
+        task = self.prefetch_slot
+        self.prefetch_slot = None
+        self.prefetch_song = None
+        if task is None:
+            return
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled() and task.exception() is None:
+            # Kill the already-spawned FFmpeg process
+            task.result().cleanup()
 
     def cancel_tasks(self) -> None:
         """Cancel all background tasks."""
-        if self.alone_check_task:
-            self.alone_check_task.cancel()
-            self.alone_check_task = None
-        if self.inactivity_timer:
-            self.inactivity_timer.cancel()
-            self.inactivity_timer = None
+        if self.watchdog_task:
+            self.watchdog_task.cancel()
+            self.watchdog_task = None
 
 
 class GuildStateManager:
@@ -97,9 +369,11 @@ class GuildStateManager:
         Returns:
             GuildMusicState for the guild
         """
-        if guild_id not in self._states:
-            self._states[guild_id] = GuildMusicState(guild_id)
-        return self._states[guild_id]
+        try:
+            return self._states[guild_id]
+        except KeyError:
+            state = self._states[guild_id] = GuildMusicState(guild_id)
+            return state
 
     def remove(self, guild_id: int) -> None:
         """
@@ -110,15 +384,16 @@ class GuildStateManager:
         Args:
             guild_id: Discord guild ID
         """
-        if guild_id in self._states:
-            state = self._states[guild_id]
+        state = self._states.pop(guild_id, None)
+        if state is not None:
             state.cancel_tasks()
             state.cleanup()
-            del self._states[guild_id]
 
     def cleanup_all(self) -> None:
         """Clean up all guild states."""
-        for state in self._states.values():
+        # Detach everything first, then clean up from the snapshot
+        states = list(self._states.values())
+        self._states.clear()
+        for state in states:
             state.cancel_tasks()
             state.cleanup()
-        self._states.clear()
@@ -0,0 +1,102 @@
+"""
+Metadata cache for yt-dlp extractions.
+
+Keeps recent extraction results in memory so repeated requests for the
+same song skip the network round-trip.
+"""
+
+import re
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from .config import EXTRACT_CACHE_MAX_ENTRIES, EXTRACT_CACHE_TTL
+
+
+# Matches the 11-character video ID in common YouTube URL shapes
+_VIDEO_ID_RE = re.compile(r'(?:[?&]v=|youtu\.be/|/shorts/)([\w-]{11})')
+
+# Cache key -> (monotonic store time, extracted data)
+_extract_cache: Dict[str, Tuple[float, Any]] = {}
+
+
+def normalize_query(query: str) -> str:
+    """
+    Build a cache key for a URL or search query.
+
+    YouTube watch URLs collapse to their video ID so that different URL
+    forms for the same video share one entry. Other URLs only have their
+    scheme and host lowercased, since paths and query values (playlist
+    IDs, for one) are case-sensitive. Search queries are lowercased.
+
+    Args:
+        query: YouTube URL or search query
+
+    Returns:
+        Normalized cache key
+    """
+    query = query.strip()
+    match = _VIDEO_ID_RE.search(query)
+    if match:
+        return f'yt:{match.group(1)}'
+    parts = urlsplit(query)
+    if parts.netloc:
+        return urlunsplit(parts._replace(
+            scheme=parts.scheme.lower(),
+            netloc=parts.netloc.lower()
+        ))
+    if query[:4].lower() == 'www.':
+        # Scheme-less URL: urlsplit sees the host as part of the path
+        host, sep, rest = query.partition('/')
+        return host.lower() + sep + rest
+    return query.lower()
+
+
+def get_cached_extraction(key: str) -> Optional[Any]:
+    """Return cached extraction data for key, or None if missing/expired."""
+    entry = _extract_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, data = entry
+    if time.monotonic() - stored_at > EXTRACT_CACHE_TTL:
+        del _extract_cache[key]
+        return None
+    return data
+
+
+def _sweep_expired(now: float) -> None:
+    """Drop expired entries from the front of the cache."""
+    # Entries are kept in store order (cache_extraction re-inserts on
+    # update), so the expired ones are always a prefix
+    while _extract_cache:
+        key = next(iter(_extract_cache))
+        if now - _extract_cache[key][0] <= EXTRACT_CACHE_TTL:
+            break
+        del _extract_cache[key]
+
+
+def cache_extraction(key: str, data: Any) -> None:
+    """
+    Store extraction data for key.
+
+    Expired entries are swept first; if the cache is still full, the
+    oldest entry is evicted.
+    """
+    now = time.monotonic()
+    _extract_cache.pop(key, None)
+    _sweep_expired(now)
+    if len(_extract_cache) >= EXTRACT_CACHE_MAX_ENTRIES:
+        del _extract_cache[next(iter(_extract_cache))]
+    _extract_cache[key] = (now, data)
+
+
+def clear_extraction_cache() -> int:
+    """
+    Drop every cached extraction.
+
+    Returns:
+        Number of entries removed
+    """
+    count = len(_extract_cache)
+    _extract_cache.clear()
+    return count
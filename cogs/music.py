@@ -8,7 +8,6 @@ Uses modular components for better maintainability.
 Features:
     - YouTube video playback via yt-dlp
     - Queue management (add, remove, clear, view)
-    - Vote-to-skip system
     - Auto-disconnect when alone or inactive
     - Channel restriction (commands only work in specified channel)
     - Volume control
@@ -20,26 +19,42 @@ Features:
 import discord
 from discord.ext import commands
 import asyncio
-from typing import Optional
+from itertools import islice
+from typing import Any, Dict, Optional, Set
 
 # Import modular components
 from .config import (
-    BUFFER_DELAY_SECONDS,
     CONNECTION_STABILIZE_DELAY,
-    COMMAND_RATE,
-    COMMAND_PER_SECONDS,
     MAX_PLAY_RETRIES,
+    PREFETCH_DEPTH,
+    RESOLVE_CONCURRENCY,
     logger
 )
 from .audio_source import YTDLSource, sanitize_title
 from .music_helpers import (
-    music_channel_only,
-    get_queue_embed,
-    calculate_required_votes
+    music_command,
+    WrongChannel,
+    get_cached_queue_embed
 )
-from .song_extractor import extract_song_info
-from .guild_state import GuildStateManager
-from .background_tasks import check_alone, check_inactivity
+from .song_extractor import (
+    extract_song_info,
+    resolve_song,
+    shutdown_extractor_pool
+)
+from .metadata_cache import clear_extraction_cache
+from .guild_state import GuildMusicState, GuildStateManager
+from .background_tasks import watchdog
+
+
+# Canned error replies; repeats within MESSAGE_THROTTLE_SECONDS are dropped
+_MSG_NOT_IN_VOICE = "❌ You need to be in a voice channel!"
+_MSG_BOT_NOT_IN_VOICE = "❌ I'm not in a voice channel!"
+_MSG_NOT_PLAYING = "❌ Nothing is playing!"
+_MSG_ALREADY_PAUSED = "❌ Already paused!"
+_MSG_NOT_PAUSED = "❌ Not paused!"
+_MSG_QUEUE_EMPTY = "❌ Queue is empty!"
+_MSG_NOT_CONNECTED = "❌ Not connected to a voice channel!"
+_MSG_BAD_VOLUME = "❌ Volume must be between 0 and 100!"
 
 
 class Music(commands.Cog):
@@ -52,7 +67,6 @@ class Music(commands.Cog):
     Features:
         - YouTube video playback
         - Queue management
-        - Vote-to-skip system
         - Auto-disconnect when alone or inactive
         - Channel restriction
         - Volume control
@@ -68,6 +82,11 @@ class Music(commands.Cog):
         """
         self.bot = bot
         self.states = GuildStateManager()
+        # Shared across guilds so playlist imports cannot flood yt-dlp
+        self._resolve_semaphore = asyncio.Semaphore(RESOLVE_CONCURRENCY)
+        # Running play_next tasks; the event loop only keeps weak
+        # references to tasks, so they are held here until they finish
+        self._play_tasks: Set[asyncio.Task] = set()
 
     def _get_state(self, ctx: commands.Context):
         """
@@ -81,10 +100,22 @@ class Music(commands.Cog):
         """
         return self.states.get(ctx.guild.id)
 
-    @property
-    def allowed_channel_name(self) -> str:
-        """Default allowed channel name for decorator compatibility."""
-        return 'music'
+    async def _send_throttled(
+        self,
+        ctx: commands.Context,
+        state: GuildMusicState,
+        message: str
+    ) -> None:
+        """
+        Send a canned reply unless it was just sent to the same channel.
+
+        Args:
+            ctx: Command context
+            state: Guild state tracking recent messages
+            message: Message text
+        """
+        if state.should_send(ctx.channel.id, message):
+            await ctx.send(message)
 
     def _start_background_tasks(self, ctx: commands.Context) -> None:
         """
@@ -95,43 +126,167 @@ class Music(commands.Cog):
         """
         state = self._get_state(ctx)
 
-        # Create getter functions for dynamic state access
-        def get_voice_client():
-            return state.voice_client
+        if state.watchdog_task is None or state.watchdog_task.done():
+            state.watchdog_task = self.bot.loop.create_task(
+                watchdog(
+                    state.get_voice_client,
+                    state.get_last_activity,
+                    state.activity_event,
+                    state.get_state_tuple,
+                    state.get_allowed_channel,
+                    state.cleanup
+                )
+            )
 
-        def get_state_tuple():
-            return (state.is_playing, state.is_paused)
+    async def _create_player(
+        self,
+        song: dict,
+        volume: float
+    ) -> discord.AudioSource:
+        """
+        Build an audio source for a queued song.
 
-        def get_last_activity():
-            return state.last_activity
+        Uses the data extracted when the entry was queued, or the result
+        of its background resolution when it was queued unresolved.
 
-        def get_allowed_channel():
-            return state.allowed_channel_name
+        Args:
+            song: Queue entry dictionary
+            volume: Playback volume (0.0 to 1.0)
 
-        def cleanup():
-            state.cleanup()
-            state.voice_client = None
+        Raises:
+            ValueError: If the entry could not be resolved
+        """
+        full_data = song.get('_full_data')
+        if not full_data:
+            pending = song.get('_resolving')
+            # Shielded so cancelling a source prefetch leaves the shared
+            # resolution running for whoever plays the entry
+            full_data = await (
+                asyncio.shield(pending) if pending is not None
+                else self._resolve(song)
+            )
+        if not full_data:
+            raise ValueError(
+                f"No extracted data for {song.get('title', 'Unknown')}"
+            )
+        return await YTDLSource.from_data(
+            full_data,
+            loop=self.bot.loop,
+            volume=volume
+        )
 
-        if state.alone_check_task is None or state.alone_check_task.done():
-            state.alone_check_task = self.bot.loop.create_task(
-                check_alone(
-                    get_voice_client,
-                    get_state_tuple,
-                    cleanup
+    async def _resolve(
+        self,
+        song: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a queue entry's extraction data, bounded by the semaphore.
+
+        Args:
+            song: Queue entry dictionary
+
+        Returns:
+            Full extraction data, or None if resolution failed
+        """
+        async with self._resolve_semaphore:
+            try:
+                return await resolve_song(song, self.bot.loop)
+            except Exception as e:
+                logger.warning(
+                    f"Could not resolve {song.get('title', 'Unknown')}: {e}"
                 )
-            )
-        if state.inactivity_timer is None or state.inactivity_timer.done():
-            state.inactivity_timer = self.bot.loop.create_task(
-                check_inactivity(
-                    get_voice_client,
-                    get_last_activity,
-                    get_state_tuple,
-                    get_allowed_channel,
-                    self.bot,
-                    cleanup
+                return None
+
+    def _resolve_ahead(self, state: GuildMusicState) -> None:
+        """
+        Resolve the next PREFETCH_DEPTH queued entries concurrently.
+
+        The task is stored on the entry as `_resolving` so that playback
+        awaits it instead of extracting the entry a second time.
+
+        Args:
+            state: Guild state whose queue should be resolved ahead
+        """
+        for song in islice(state.queue, PREFETCH_DEPTH):
+            if not song.get('_full_data') and '_resolving' not in song:
+                song['_resolving'] = self.bot.loop.create_task(
+                    self._resolve(song)
                 )
+
+    def _prefetch_next(self, state: GuildMusicState) -> None:
+        """
+        Start building the next queued song's source in the background.
+
+        Only one source prefetch is kept in flight per guild; metadata
+        for the entries behind it is resolved ahead as well.
+
+        Args:
+            state: Guild state whose queue head should be prefetched
+        """
+        state.cancel_prefetch()
+        self._resolve_ahead(state)
+        if state.queue:
+            song = state.queue[0]
+            state.prefetch_song = song
+            state.prefetch_slot = self.bot.loop.create_task(
+                self._create_player(song, state.volume)
             )
 
+    async def _take_prefetched(
+        self,
+        state: GuildMusicState,
+        song: dict
+    ) -> Optional[discord.AudioSource]:
+        """
+        Claim the prefetched source for song, if one was built.
+
+        Args:
+            state: Guild state holding the prefetch slot
+            song: Song about to be played
+
+        Returns:
+            The prefetched YTDLSource, or None if unavailable
+        """
+        task = state.prefetch_slot
+        if task is None or state.prefetch_song is not song:
+            # Nothing prefetched, or the queue changed since it started
+            state.cancel_prefetch()
+            return None
+
+        state.prefetch_slot = None
+        state.prefetch_song = None
+        try:
+            return await task
+        except asyncio.CancelledError:
+            return None
+        except Exception as e:
+            logger.warning(f"Prefetch failed, extracting again: {e}")
+            return None
+
+    def _schedule_play_next(self, ctx: commands.Context) -> None:
+        """
+        Queue play_next on the event loop from the voice player thread.
+
+        Args:
+            ctx: Command context to continue playback in
+        """
+        self.bot.loop.call_soon_threadsafe(self._create_next_task, ctx)
+
+    def _create_next_task(self, ctx: commands.Context) -> None:
+        """Start play_next as a task; runs on the event loop thread."""
+        task = self.bot.loop.create_task(self.play_next(ctx))
+        self._play_tasks.add(task)
+        task.add_done_callback(self._on_play_next_done)
+
+    def _on_play_next_done(self, task: asyncio.Task) -> None:
+        """Release a finished play_next task, logging it if it failed."""
+        self._play_tasks.discard(task)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            logger.error(f"play_next failed: {error}")
+
     async def play_next(self, ctx: commands.Context) -> None:
         """
         Play the next song in the queue.
@@ -144,81 +299,68 @@ class Music(commands.Cog):
         """
         state = self._get_state(ctx)
 
-        if not state.queue:
-            state.is_playing = False
-            state.current_song = None
-            state.play_retry_count = 0
-            await ctx.send("Queue is empty! Use `!play` to add more songs.")
-            return
-
-        # Get next song from queue
-        state.current_song = state.queue.popleft()
-
-        try:
-            # Create audio source from stored data
-            # Check if we have full data, otherwise extract
-            if '_full_data' in state.current_song:
-                player = await YTDLSource.from_data(
-                    state.current_song['_full_data'],
-                    loop=self.bot.loop
-                )
-            else:
-                # Fallback: extract from URL
-                url = (
-                    state.current_song.get('webpage_url') or
-                    state.current_song.get('url') or
-                    f"https://www.youtube.com/watch?v="
-                    f"{state.current_song.get('id')}"
-                )
-                player = await YTDLSource.from_url(
-                    url,
-                    loop=self.bot.loop,
-                    stream=True
+        # Loop rather than recurse so failed songs are skipped in one frame
+        while True:
+            if not state.queue:
+                state.is_playing = False
+                state.current_song = None
+                state.play_retry_count = 0
+                await ctx.send(
+                    "Queue is empty! Use `!play` to add more songs."
                 )
+                return
 
-            # Small delay to ensure buffer is ready (reduces stuttering)
-            await asyncio.sleep(BUFFER_DELAY_SECONDS)
+            # Get next song from queue
+            state.current_song = state.queue.popleft()
 
-            def after_callback(error: Optional[Exception]) -> None:
-                """Callback after song finishes or errors."""
-                if error is None:
-                    state.play_retry_count = 0  # Reset on success
-                    asyncio.run_coroutine_threadsafe(
-                        self.play_next(ctx), self.bot.loop
+            try:
+                # Use the source prefetched while the previous song played
+                player = await self._take_prefetched(
+                    state, state.current_song
+                )
+                if player is None:
+                    player = await self._create_player(
+                        state.current_song, state.volume
                     )
+                elif isinstance(player, discord.PCMVolumeTransformer):
+                    # Volume may have changed since the prefetch started
+                    player.volume = state.volume
+
+                def after_callback(error: Optional[Exception]) -> None:
+                    """Callback after song finishes or errors."""
+                    if error is None:
+                        state.play_retry_count = 0  # Reset on success
+                        self._schedule_play_next(ctx)
+                    else:
+                        logger.error(f'Player error: {error}')
+
+                # Start playback
+                if state.voice_client:
+                    state.voice_client.play(player, after=after_callback)
+                    state.is_playing = True
+                    state.is_paused = False
+                    state.play_retry_count = 0
+                    self._prefetch_next(state)
                 else:
-                    logger.error(f'Player error: {error}')
-
-            # Start playback
-            if state.voice_client:
-                # #region agent log
-                import json
-                with open(r'c:\Users\Kevin\Desktop\Github\disco_bot\.cursor\debug.log', 'a', encoding='utf-8') as f:
-                    f.write(json.dumps({'sessionId':'debug-session','runId':'post-fix','hypothesisId':'H5','location':'music.py:194','message':'Playback start (WORKING)','data':{'latency_ms':state.voice_client.latency*1000,'avg_latency_ms':state.voice_client.average_latency*1000},'timestamp':__import__('time').time()*1000}) + '\n')
-                # #endregion
-                
-                state.voice_client.play(player, after=after_callback)
-                state.is_playing = True
-                state.is_paused = False
-                state.skip_votes.clear()
-                state.play_retry_count = 0
-            else:
-                logger.warning("Voice client not available for playback")
-                state.is_playing = False
+                    logger.warning(
+                        "Voice client not available for playback"
+                    )
+                    state.is_playing = False
+                return
+
+            except Exception as e:
+                logger.error(f'Error playing song: {e}')
+                await ctx.send(f'❌ Error playing song: {str(e)}')
+
+                # Retry with the next song, up to the retry limit
+                state.play_retry_count += 1
+                if state.play_retry_count < MAX_PLAY_RETRIES:
+                    logger.info(
+                        f"Retrying play_next ({state.play_retry_count}/"
+                        f"{MAX_PLAY_RETRIES})"
+                    )
+                    continue
 
-        except Exception as e:
-            logger.error(f'Error playing song: {e}')
-            await ctx.send(f'❌ Error playing song: {str(e)}')
-
-            # Retry with limit to prevent infinite recursion
-            state.play_retry_count += 1
-            if state.play_retry_count < MAX_PLAY_RETRIES:
-                logger.info(
-                    f"Retrying play_next ({state.play_retry_count}/"
-                    f"{MAX_PLAY_RETRIES})"
-                )
-                await self.play_next(ctx)
-            else:
                 logger.error(
                     f"Max retries ({MAX_PLAY_RETRIES}) reached, stopping"
                 )
@@ -229,39 +371,39 @@ class Music(commands.Cog):
                     "Queue cleared."
                 )
                 state.queue.clear()
+                state.cancel_prefetch()
+                return
 
     # ========================================================================
     # COMMANDS - VOICE CHANNEL MANAGEMENT
     # ========================================================================
 
-    @commands.command(name='join', aliases=['connect'])
-    @commands.cooldown(
-        COMMAND_RATE, COMMAND_PER_SECONDS, commands.BucketType.user
-    )
-    @music_channel_only()
-    async def join(self, ctx: commands.Context) -> None:
+    @music_command(name='join', aliases=['connect'])
+    async def join(
+        self,
+        ctx: commands.Context,
+        state: GuildMusicState
+    ) -> None:
         """
         Join the voice channel the user is currently in.
 
         If bot is already in a different channel, disconnects first.
         Starts background tasks for auto-disconnect checks.
         """
-        state = self._get_state(ctx)
-
         if ctx.author.voice is None:
-            await ctx.send("❌ You need to be in a voice channel!")
+            await self._send_throttled(ctx, state, _MSG_NOT_IN_VOICE)
             return
 
         channel = ctx.author.voice.channel
-        state.update_activity()
+        vc = ctx.voice_client
 
         try:
             # Disconnect from existing connection if in different channel
-            if ctx.voice_client is not None:
-                if ctx.voice_client.channel == channel:
+            if vc is not None:
+                if vc.channel == channel:
                     await ctx.send(f"✅ Already in **{channel.name}**")
                     return
-                await ctx.voice_client.disconnect()
+                await vc.disconnect()
 
             # Connect to voice channel
             state.voice_client = await channel.connect()
@@ -304,28 +446,26 @@ class Music(commands.Cog):
             )
             logger.error(f'Voice connection error ({error_type}): {e}')
 
-    @commands.command(name='switch', aliases=['move', 'change'])
-    @commands.cooldown(
-        COMMAND_RATE, COMMAND_PER_SECONDS, commands.BucketType.user
-    )
-    @music_channel_only()
-    async def switch(self, ctx: commands.Context) -> None:
+    @music_command(name='switch', aliases=['move', 'change'])
+    async def switch(
+        self,
+        ctx: commands.Context,
+        state: GuildMusicState
+    ) -> None:
         """
         Switch to the voice channel you're currently in.
 
         If bot is not connected, joins your channel.
         """
-        state = self._get_state(ctx)
-        state.update_activity()
-
         if ctx.author.voice is None:
-            await ctx.send("❌ You need to be in a voice channel!")
+            await self._send_throttled(ctx, state, _MSG_NOT_IN_VOICE)
             return
 
         user_voice_channel = ctx.author.voice.channel
+        vc = ctx.voice_client
 
         # If not connected, join user's channel
-        if ctx.voice_client is None:
+        if vc is None:
             try:
                 state.voice_client = await user_voice_channel.connect()
                 self._start_background_tasks(ctx)
@@ -337,9 +477,9 @@ class Music(commands.Cog):
                 return
 
         # If in different channel, move to user's channel
-        elif ctx.voice_client.channel != user_voice_channel:
+        elif vc.channel != user_voice_channel:
             try:
-                await ctx.voice_client.move_to(user_voice_channel)
+                await vc.move_to(user_voice_channel)
                 await ctx.send(
                     f"🔀 Switched to **{user_voice_channel.name}**"
                 )
@@ -351,22 +491,19 @@ class Music(commands.Cog):
         else:
             await ctx.send(f"✅ Already in **{user_voice_channel.name}**")
 
-    @commands.command(name='leave', aliases=['disconnect', 'dc'])
-    @commands.cooldown(
-        COMMAND_RATE, COMMAND_PER_SECONDS, commands.BucketType.user
-    )
-    @music_channel_only()
-    async def leave(self, ctx: commands.Context) -> None:
+    @music_command(name='leave', aliases=['disconnect', 'dc'])
+    async def leave(
+        self,
+        ctx: commands.Context,
+        state: GuildMusicState
+    ) -> None:
         """Leave the current voice channel."""
-        state = self._get_state(ctx)
-        state.update_activity()
-
-        if ctx.voice_client is None:
-            await ctx.send("❌ I'm not in a voice channel!")
+        vc = ctx.voice_client
+        if vc is None:
+            await self._send_throttled(ctx, state, _MSG_BOT_NOT_IN_VOICE)
             return
 
-        await ctx.voice_client.disconnect()
-        state.voice_client = None
+        await vc.disconnect()
         state.cleanup()
         state.cancel_tasks()
 
@@ -376,12 +513,14 @@ class Music(commands.Cog):
     # COMMANDS - PLAYBACK CONTROL
     # ========================================================================
 
-    @commands.command(name='play', aliases=['p'])
-    @commands.cooldown(
-        COMMAND_RATE, COMMAND_PER_SECONDS, commands.BucketType.user
-    )
-    @music_channel_only()
-    async def play(self, ctx: commands.Context, *, query: str) -> None:
+    @music_command(name='play', aliases=['p'])
+    async def play(
+        self,
+        ctx: commands.Context,
+        state: GuildMusicState,
+        *,
+        query: str
+    ) -> None:
         """
         Play a YouTube video or search for a video.
 
@@ -390,16 +529,14 @@ class Music(commands.Cog):
         Args:
             query: YouTube URL or search query
         """
-        state = self._get_state(ctx)
-        state.update_activity()
-
         # Check if user is in a voice channel
         if ctx.author.voice is None:
-            await ctx.send("❌ You need to be in a voice channel!")
+            await self._send_throttled(ctx, state, _MSG_NOT_IN_VOICE)
             return
 
         # Ensure bot is connected to user's channel
-        if ctx.voice_client is None:
+        vc = ctx.voice_client
+        if vc is None:
             try:
                 user_voice_channel = ctx.author.voice.channel
                 state.voice_client = await user_voice_channel.connect()
@@ -410,8 +547,8 @@ class Music(commands.Cog):
                     f"❌ Could not join voice channel: {str(e)}"
                 )
                 return
-        elif ctx.voice_client.channel != ctx.author.voice.channel:
-            current_channel = ctx.voice_client.channel.name
+        elif vc.channel != ctx.author.voice.channel:
+            current_channel = vc.channel.name
             user_channel = ctx.author.voice.channel.name
             await ctx.send(
                 f"❌ Bot is in **{current_channel}**, but you're in "
@@ -439,9 +576,22 @@ class Music(commands.Cog):
                     )
                     return
 
-                # Add additional songs to queue
-                for additional in additional_songs:
-                    state.queue.append(additional)
+                # Add additional songs to queue, keeping a slot free for
+                # the requested song if it is going to be queued as well
+                will_queue = state.is_playing or state.is_paused
+                room = max(
+                    state.queue.maxlen - len(state.queue) -
+                    (1 if will_queue else 0),
+                    0
+                )
+                state.queue.extend(additional_songs[:room])
+                dropped = len(additional_songs) - room
+                if dropped > 0:
+                    await ctx.send(
+                        f"⚠️ Queue limit reached "
+                        f"({state.queue.maxlen} songs max): skipped "
+                        f"{dropped} playlist song(s)"
+                    )
 
                 # Create song info dictionary with full data
                 song_info = {
@@ -452,11 +602,20 @@ class Music(commands.Cog):
                     'thumbnail': song.get('thumbnail'),
                     '_full_data': song  # Keep full data to avoid re-extraction
                 }
+                song_info['_safe_title'] = sanitize_title(song_info['title'])
 
                 # Add to queue if already playing, otherwise start playback
                 if state.is_playing or state.is_paused:
+                    if state.is_queue_full():
+                        await ctx.send(
+                            f"❌ Queue is full! "
+                            f"({state.queue.maxlen} songs max)"
+                        )
+                        return
                     state.queue.append(song_info)
-                    title = sanitize_title(song_info['title'])
+                    if state.prefetch_slot is None:
+                        self._prefetch_next(state)
+                    title = song_info['_safe_title']
                     await ctx.send(f"✅ Added to queue: **{title}**")
                 else:
                     state.current_song = song_info
@@ -467,7 +626,8 @@ class Music(commands.Cog):
                     try:
                         player = await YTDLSource.from_data(
                             song,  # Pass already-extracted data
-                            loop=self.bot.loop
+                            loop=self.bot.loop,
+                            volume=state.volume
                         )
                         logger.info("Audio source created successfully")
                     except Exception as source_error:
@@ -482,20 +642,15 @@ class Music(commands.Cog):
                         return
 
                     # Send "Now Playing" message immediately (before playback)
-                    title = sanitize_title(song_info['title'])
+                    title = song_info['_safe_title']
                     await ctx.send(f"🎵 **Now Playing:** {title}")
 
-                    # Small delay to ensure buffer is ready
-                    await asyncio.sleep(BUFFER_DELAY_SECONDS)
-
                     def after_play_callback(
                         error: Optional[Exception]
                     ) -> None:
                         """Callback after song finishes."""
                         if error is None:
-                            asyncio.run_coroutine_threadsafe(
-                                self.play_next(ctx), self.bot.loop
-                            )
+                            self._schedule_play_next(ctx)
                         else:
                             logger.error(f'Player error: {error}')
 
@@ -503,20 +658,14 @@ class Music(commands.Cog):
                     voice_client = ctx.voice_client or state.voice_client
                     if voice_client:
                         try:
-                            # #region agent log
-                            import json
-                            with open(r'c:\Users\Kevin\Desktop\Github\disco_bot\.cursor\debug.log', 'a', encoding='utf-8') as f:
-                                f.write(json.dumps({'sessionId':'debug-session','runId':'post-fix','hypothesisId':'H3,H5','location':'music.py:500','message':'Play cmd start (WORKING)','data':{'already_playing':voice_client.is_playing(),'latency_ms':voice_client.latency*1000},'timestamp':__import__('time').time()*1000}) + '\n')
-                            # #endregion
-                            
                             voice_client.play(
                                 player, after=after_play_callback
                             )
                             state.is_playing = True
                             state.is_paused = False
-                            state.skip_votes.clear()
                             # Sync state.voice_client with ctx.voice_client
                             state.voice_client = voice_client
+                            self._prefetch_next(state)
                         except Exception as play_error:
                             logger.error(
                                 f'Error starting playback: {play_error}',
@@ -538,85 +687,77 @@ class Music(commands.Cog):
                     "Check console for full error details."
                 )
 
-    @commands.command(name='pause')
-    @commands.cooldown(
-        COMMAND_RATE, COMMAND_PER_SECONDS, commands.BucketType.user
-    )
-    @music_channel_only()
-    async def pause(self, ctx: commands.Context) -> None:
+    @music_command(name='pause')
+    async def pause(
+        self,
+        ctx: commands.Context,
+        state: GuildMusicState
+    ) -> None:
         """Pause the currently playing song."""
-        state = self._get_state(ctx)
-        state.update_activity()
-
-        if ctx.voice_client is None or not state.is_playing:
-            await ctx.send("❌ Nothing is playing!")
+        vc = ctx.voice_client
+        if vc is None or not state.is_playing:
+            await self._send_throttled(ctx, state, _MSG_NOT_PLAYING)
             return
 
         if not state.is_paused:
-            ctx.voice_client.pause()
+            vc.pause()
             state.is_paused = True
             await ctx.send("⏸️ Paused")
         else:
-            await ctx.send("❌ Already paused!")
-
-    @commands.command(name='resume')
-    @commands.cooldown(
-        COMMAND_RATE, COMMAND_PER_SECONDS, commands.BucketType.user
-    )
-    @music_channel_only()
-    async def resume(self, ctx: commands.Context) -> None:
-        """Resume the paused song."""
-        state = self._get_state(ctx)
-        state.update_activity()
+            await self._send_throttled(ctx, state, _MSG_ALREADY_PAUSED)
 
-        if ctx.voice_client is None:
-            await ctx.send("❌ Nothing is playing!")
+    @music_command(name='resume')
+    async def resume(
+        self,
+        ctx: commands.Context,
+        state: GuildMusicState
+    ) -> None:
+        """Resume the paused song."""
+        vc = ctx.voice_client
+        if vc is None:
+            await self._send_throttled(ctx, state, _MSG_NOT_PLAYING)
             return
 
         if state.is_paused:
-            ctx.voice_client.resume()
+            vc.resume()
             state.is_paused = False
             await ctx.send("▶️ Resumed")
         else:
-            await ctx.send("❌ Not paused!")
-
-    @commands.command(name='stop')
-    @commands.cooldown(
-        COMMAND_RATE, COMMAND_PER_SECONDS, commands.BucketType.user
-    )
-    @music_channel_only()
-    async def stop(self, ctx: commands.Context) -> None:
-        """Stop the current song and clear the queue."""
-        state = self._get_state(ctx)
-        state.update_activity()
+            await self._send_throttled(ctx, state, _MSG_NOT_PAUSED)
 
-        if ctx.voice_client is None:
-            await ctx.send("❌ Nothing is playing!")
+    @music_command(name='stop')
+    async def stop(
+        self,
+        ctx: commands.Context,
+        state: GuildMusicState
+    ) -> None:
+        """Stop the current song and clear the queue."""
+        vc = ctx.voice_client
+        if vc is None:
+            await self._send_throttled(ctx, state, _MSG_NOT_PLAYING)
             return
 
-        ctx.voice_client.stop()
+        vc.stop()
         state.queue.clear()
+        state.cancel_prefetch()
         state.is_playing = False
         state.is_paused = False
         state.current_song = None
         await ctx.send("⏹️ Stopped")
 
-    @commands.command(name='skip', aliases=['next', 's'])
-    @commands.cooldown(
-        COMMAND_RATE, COMMAND_PER_SECONDS, commands.BucketType.user
-    )
-    @music_channel_only()
-    async def skip(self, ctx: commands.Context) -> None:
+    @music_command(name='skip', aliases=['next', 's'])
+    async def skip(
+        self,
+        ctx: commands.Context,
+        state: GuildMusicState
+    ) -> None:
         """Skip the current song immediately."""
-        state = self._get_state(ctx)
-        state.update_activity()
-
-        if ctx.voice_client is None or not state.is_playing:
-            await ctx.send("❌ Nothing is playing!")
+        vc = ctx.voice_client
+        if vc is None or not state.is_playing:
+            await self._send_throttled(ctx, state, _MSG_NOT_PLAYING)
             return
         # Skip immediately (no voting required)
-        ctx.voice_client.stop()
-        state.skip_votes.clear()
+        vc.stop()
         await ctx.send("⏭️ Skipped")
 
 
@@ -624,42 +765,37 @@ class Music(commands.Cog):
     # COMMANDS - QUEUE MANAGEMENT
     # ========================================================================
 
-    @commands.command(name='queue', aliases=['q'])
-    @commands.cooldown(
-        COMMAND_RATE, COMMAND_PER_SECONDS, commands.BucketType.user
-    )
-    @music_channel_only()
-    async def queue(self, ctx: commands.Context) -> None:
+    @music_command(name='queue', aliases=['q'])
+    async def queue(
+        self,
+        ctx: commands.Context,
+        state: GuildMusicState
+    ) -> None:
         """Display the current music queue."""
-        state = self._get_state(ctx)
-        state.update_activity()
-        embed = get_queue_embed(state.current_song, state.queue)
+        embed = get_cached_queue_embed(state)
         await ctx.send(embed=embed)
 
-    @commands.command(name='clear')
-    @commands.cooldown(
-        COMMAND_RATE, COMMAND_PER_SECONDS, commands.BucketType.user
-    )
-    @music_channel_only()
-    async def clear(self, ctx: commands.Context) -> None:
+    @music_command(name='clear')
+    async def clear(
+        self,
+        ctx: commands.Context,
+        state: GuildMusicState
+    ) -> None:
         """Clear the music queue."""
-        state = self._get_state(ctx)
-        state.update_activity()
         state.queue.clear()
+        state.cancel_prefetch()
         await ctx.send("🗑️ Queue cleared!")
 
-    @commands.command(name='remove')
-    @commands.cooldown(
-        COMMAND_RATE, COMMAND_PER_SECONDS, commands.BucketType.user
-    )
-    @music_channel_only()
-    async def remove(self, ctx: commands.Context, position: int) -> None:
+    @music_command(name='remove')
+    async def remove(
+        self,
+        ctx: commands.Context,
+        state: GuildMusicState,
+        position: int
+    ) -> None:
         """Remove a song from the queue by position number."""
-        state = self._get_state(ctx)
-        state.update_activity()
-
         if not state.queue:
-            await ctx.send("❌ Queue is empty!")
+            await self._send_throttled(ctx, state, _MSG_QUEUE_EMPTY)
             return
 
         if position < 1 or position > len(state.queue):
@@ -670,13 +806,17 @@ class Music(commands.Cog):
             )
             return
 
-        # Convert deque to list, remove item, convert back
-        from collections import deque
-        queue_list = list(state.queue)
-        removed_song = queue_list.pop(position - 1)
-        state.queue = deque(queue_list)
-
-        title = sanitize_title(removed_song.get('title', 'Unknown'))
+        # Rotate the target to the front, pop it, rotate back (in place,
+        # so the queue object's identity is preserved)
+        q = state.queue
+        q.rotate(-(position - 1))
+        removed_song = q.popleft()
+        q.rotate(position - 1)
+        if position == 1:
+            # The prefetched source belonged to the removed song
+            state.cancel_prefetch()
+
+        title = removed_song['_safe_title']
         await ctx.send(
             f"🗑️ Removed **{title}** from position {position}"
         )
@@ -685,42 +825,50 @@ class Music(commands.Cog):
     # COMMANDS - SETTINGS
     # ========================================================================
 
-    @commands.command(name='volume', aliases=['vol'])
-    @commands.cooldown(
-        COMMAND_RATE, COMMAND_PER_SECONDS, commands.BucketType.user
-    )
-    @music_channel_only()
+    @music_command(name='volume', aliases=['vol'])
     async def volume(
         self,
         ctx: commands.Context,
+        state: GuildMusicState,
         volume: Optional[int] = None
     ) -> None:
-        """Set or display the playback volume (0-100)."""
-        state = self._get_state(ctx)
-        state.update_activity()
+        """
+        Set or display the playback volume (0-100).
 
-        if ctx.voice_client is None:
-            await ctx.send("❌ Not connected to a voice channel!")
+        At 100% songs play through the Opus passthrough source, which has
+        no volume control; moving to or from 100% while such a song is
+        playing takes effect from the next song.
+        """
+        vc = ctx.voice_client
+        if vc is None:
+            await self._send_throttled(ctx, state, _MSG_NOT_CONNECTED)
             return
 
         if volume is None:
-            # Display current volume (with null check)
-            if ctx.voice_client.source:
-                vol_percent = int(ctx.voice_client.source.volume * 100)
-                await ctx.send(f"🔊 Current volume: {vol_percent}%")
-            else:
-                await ctx.send("❌ No audio source active!")
+            vol_percent = int(state.volume * 100)
+            await ctx.send(f"🔊 Current volume: {vol_percent}%")
             return
 
         # Set volume
-        if 0 <= volume <= 100:
-            if ctx.voice_client.source:
-                ctx.voice_client.source.volume = volume / 100
-                await ctx.send(f"🔊 Volume set to {volume}%")
-            else:
-                await ctx.send("❌ No audio source active!")
+        if not 0 <= volume <= 100:
+            await self._send_throttled(ctx, state, _MSG_BAD_VOLUME)
+            return
+
+        was_full = state.volume >= 1.0
+        state.volume = volume / 100
+        if (state.volume >= 1.0) != was_full:
+            # The prefetched source was built for the other output path
+            self._prefetch_next(state)
+
+        source = vc.source
+        if source is None or isinstance(source, discord.PCMVolumeTransformer):
+            if source is not None:
+                source.volume = state.volume
+            await ctx.send(f"🔊 Volume set to {volume}%")
         else:
-            await ctx.send("❌ Volume must be between 0 and 100!")
+            await ctx.send(
+                f"🔊 Volume set to {volume}% (applies from the next song)"
+            )
 
     @commands.command(name='setchannel', aliases=['channel'])
     @commands.has_permissions(administrator=True)
@@ -733,11 +881,21 @@ class Music(commands.Cog):
         """Change the allowed channel for music commands (Admin only)."""
         state = self._get_state(ctx)
         state.allowed_channel_name = channel_name.lower().strip()
+        state.allowed_channel_id = None
+        state.get_allowed_channel(ctx.guild)
         await ctx.send(
             f"✅ Music commands are now restricted to "
             f"**#{state.allowed_channel_name}** channel!"
         )
 
+    @commands.command(name='flushcache')
+    @commands.has_permissions(administrator=True)
+    @commands.cooldown(1, 10, commands.BucketType.guild)
+    async def flushcache(self, ctx: commands.Context) -> None:
+        """Clear cached song metadata (Admin only)."""
+        count = clear_extraction_cache()
+        await ctx.send(f"🧹 Cleared {count} cached extraction(s).")
+
     # ========================================================================
     # ERROR HANDLERS
     # ========================================================================
@@ -760,10 +918,10 @@ class Music(commands.Cog):
         error: commands.CommandError
     ) -> None:
         """Handle command-specific errors."""
-        if isinstance(error, commands.CommandOnCooldown):
+        if isinstance(error, WrongChannel):
             await ctx.send(
-                f"⏳ Command on cooldown. Try again in "
-                f"{error.retry_after:.1f}s"
+                f"❌ Music commands can only be used in the "
+                f"**#{error.allowed_channel_name}** channel!"
             )
         elif isinstance(error, commands.MissingPermissions):
             await ctx.send("❌ You don't have permission to use this command!")
@@ -779,6 +937,7 @@ class Music(commands.Cog):
         """Cleanup when cog is unloaded."""
         logger.info("Unloading Music cog, cleaning up...")
         self.states.cleanup_all()
+        shutdown_extractor_pool()
         for vc in self.bot.voice_clients:
             asyncio.create_task(vc.disconnect())
 
@@ -7,12 +7,32 @@ and other helper functions.
 
 import discord
 from discord.ext import commands
+import inspect
 import re
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
 from collections import deque
-from functools import wraps
+from functools import lru_cache, wraps
+from itertools import islice
 
-from .config import MAX_QUEUE_DISPLAY
+from .config import (
+    COMMAND_RATE,
+    COMMAND_PER_SECONDS,
+    MAX_QUEUE_DISPLAY
+)
+from .guild_state import GuildMusicState
+
+# Emojis and special characters stripped from channel names before matching
+_CHANNEL_CLEAN_RE = re.compile(r'[^\w\s]')
+
+# Discord markdown characters escaped by sanitize_for_embed (single pass)
+_MD_ESCAPE_TABLE = str.maketrans({c: '\\' + c for c in '*_~`|'})
+
+# Cooldown reply template; also the throttle key, since the filled-in
+# retry time differs on every attempt
+_COOLDOWN_MSG = "⏳ Command on cooldown. Try again in {:.1f}s"
+
+# Name of the guild state parameter music_command injects after ctx
+_STATE_PARAM = 'state'
 
 
 def check_channel(ctx: commands.Context, allowed_channel_name: str) -> bool:
@@ -30,37 +50,135 @@ def check_channel(ctx: commands.Context, allowed_channel_name: str) -> bool:
     Returns:
         True if channel name contains allowed channel name, False otherwise
     """
-    channel_name = ctx.channel.name.lower().strip()
-    # Remove emojis and special characters, keep alphanumeric and spaces
-    channel_clean = re.sub(r'[^\w\s]', '', channel_name)
+    return _channel_matches(ctx.channel.name, allowed_channel_name)
+
+
+@lru_cache(maxsize=256)
+def _channel_matches(channel_name: str, allowed_channel_name: str) -> bool:
+    """Match a raw channel name against the allowed name (memoized)."""
+    channel_name = channel_name.lower().strip()
     allowed_name = allowed_channel_name.lower().strip()
+    if channel_name == allowed_name:
+        # Common case: plain channel name, no cleaning needed
+        return True
+    # Remove emojis and special characters, keep alphanumeric and spaces
+    channel_clean = _CHANNEL_CLEAN_RE.sub('', channel_name)
     return allowed_name in channel_clean or channel_clean == allowed_name
 
 
-def music_channel_only():
+class WrongChannel(commands.CheckFailure):
+    """Raised when a music command is used outside the allowed channel."""
+
+    def __init__(self, allowed_channel_name: str):
+        self.allowed_channel_name = allowed_channel_name
+        super().__init__(
+            f"Music commands can only be used in #{allowed_channel_name}"
+        )
+
+
+def _music_channel_check():
     """
-    Decorator to restrict commands to the allowed music channel.
+    Command check restricting a command to the guild's music channel.
+
+    The guild state it looks up is kept on the context as `music_state`
+    for the music_command wrapper.
 
-    Must be applied after @commands.command() decorator.
-    Automatically sends error message if used in wrong channel.
+    Raises:
+        NoPrivateMessage: If the command is used outside a guild
+        WrongChannel: If the command is used in any other channel
+    """
+    def predicate(ctx: commands.Context) -> bool:
+        if ctx.guild is None:
+            raise commands.NoPrivateMessage()
+        state = ctx.cog.states.get(ctx.guild.id)
+        if not check_channel(ctx, state.allowed_channel_name):
+            raise WrongChannel(state.allowed_channel_name)
+        ctx.music_state = state
+        return True
+
+    return commands.check(predicate)
+
+
+def music_command(
+    name: str,
+    *,
+    rate: int = COMMAND_RATE,
+    per: float = COMMAND_PER_SECONDS,
+    **attrs
+):
+    """
+    Decorator that registers a music command.
+
+    The channel restriction is attached as a command check, so discord.py
+    rejects wrong-channel use (raising WrongChannel) before it converts
+    any arguments. The check also hides the command from !help outside
+    the music channel. The per-user cooldown and activity update run in
+    the wrapper, which passes the guild state found by the check to the
+    command as its `state` argument after ctx. Sends an error message
+    (throttled per channel, like other canned replies) and skips the
+    command while on cooldown.
+
+    Replaces @commands.command(); remaining keyword arguments (e.g.
+    aliases) are passed through to it.
+
+    Args:
+        name: Command name
+        rate: Uses allowed per user within each cooldown window
+        per: Cooldown window length in seconds
+
+    Raises:
+        TypeError: If the command's third parameter is not `state`
     """
     def decorator(func):
+        signature = inspect.signature(func)
+        parameters = list(signature.parameters.values())
+        if len(parameters) < 3 or parameters[2].name != _STATE_PARAM:
+            raise TypeError(
+                f"music command {func.__qualname__} must take "
+                f"(self, ctx, {_STATE_PARAM}, ...)"
+            )
+
         @wraps(func)
         async def wrapper(self, ctx: commands.Context, *args, **kwargs):
-            if not check_channel(ctx, self.allowed_channel_name):
-                await ctx.send(
-                    f"❌ Music commands can only be used in the "
-                    f"**#{self.allowed_channel_name}** channel!"
-                )
+            # Set by the channel check; Context.invoke() skips checks
+            state = getattr(ctx, 'music_state', None)
+            if state is None:
+                state = self.states.get(ctx.guild.id)
+            retry_after = state.check_cooldown(
+                (name, ctx.author.id), rate, per
+            )
+            if retry_after:
+                if state.should_send(ctx.channel.id, _COOLDOWN_MSG):
+                    await ctx.send(_COOLDOWN_MSG.format(retry_after))
                 return
-            return await func(self, ctx, *args, **kwargs)
-        return wrapper
+
+            state.update_activity()
+            return await func(self, ctx, state, *args, **kwargs)
+
+        # Hide the injected state parameter from discord.py's argument
+        # parsing, which reads the callback signature and expects its own
+        # Parameter type there
+        params = [
+            commands.Parameter(
+                param.name,
+                param.kind,
+                default=param.default,
+                annotation=param.annotation
+            )
+            for param in parameters
+            if param.name != _STATE_PARAM
+        ]
+        wrapper.__signature__ = signature.replace(parameters=params)
+
+        command = commands.command(name=name, **attrs)(wrapper)
+        return _music_channel_check()(command)
     return decorator
 
 
 def get_queue_embed(
     current_song: Optional[Dict[str, Any]],
-    queue: deque
+    queue: deque,
+    preview: Optional[Iterable[Dict[str, Any]]] = None
 ) -> discord.Embed:
     """
     Create a Discord embed showing the current queue.
@@ -68,6 +186,7 @@ def get_queue_embed(
     Args:
         current_song: Currently playing song dictionary
         queue: Queue of songs
+        preview: Cached first MAX_QUEUE_DISPLAY songs of queue, if known
 
     Returns:
         Embed with current song and queue list
@@ -85,23 +204,53 @@ def get_queue_embed(
 
     # Show queue (up to MAX_QUEUE_DISPLAY items)
     if queue:
-        queue_list = []
-        for i, song in enumerate(list(queue)[:MAX_QUEUE_DISPLAY], 1):
-            title = sanitize_for_embed(song.get('title', 'Unknown'))
-            queue_list.append(f"{i}. {title}")
-
-        if len(queue) > MAX_QUEUE_DISPLAY:
-            remaining = len(queue) - MAX_QUEUE_DISPLAY
-            queue_list.append(f"... and {remaining} more")
-
-        queue_value = "\n".join(queue_list) if queue_list else "Queue is empty"
-        embed.add_field(name="Up Next", value=queue_value, inline=False)
+        if preview is None:
+            preview = islice(queue, MAX_QUEUE_DISPLAY)
+        lines = [
+            f"{i}. {sanitize_for_embed(song.get('title', 'Unknown'))}"
+            for i, song in enumerate(preview, 1)
+        ]
+
+        qlen = len(queue)
+        if qlen > MAX_QUEUE_DISPLAY:
+            lines.append(f"... and {qlen - MAX_QUEUE_DISPLAY} more")
+
+        embed.add_field(name="Up Next", value="\n".join(lines), inline=False)
     else:
         embed.add_field(name="Up Next", value="Queue is empty", inline=False)
 
     return embed
 
 
+def get_cached_queue_embed(state: GuildMusicState) -> discord.Embed:
+    """
+    Get the queue embed for a guild, reusing the last one if unchanged.
+
+    The embed is rebuilt only when the queue version or the current song
+    differs from when it was last rendered.
+
+    Args:
+        state: Guild state to render
+
+    Returns:
+        Embed with current song and queue list
+    """
+    version = state.queue_version
+    current_song = state.current_song
+    cached = state.queue_embed_cache
+    if (
+        cached is not None and
+        cached[0] == version and
+        cached[1] is current_song
+    ):
+        return cached[2]
+
+    embed = get_queue_embed(current_song, state.queue, state.display_queue())
+    state.queue_embed_cache = (version, current_song, embed)
+    return embed
+
+
+@lru_cache(maxsize=1024)
 def sanitize_for_embed(text: str) -> str:
     """
     Sanitize text for safe display in Discord embeds.
@@ -116,9 +265,7 @@ def sanitize_for_embed(text: str) -> str:
         return 'Unknown'
 
     # Escape Discord markdown characters
-    markdown_chars = ['*', '_', '~', '`', '|']
-    for char in markdown_chars:
-        text = text.replace(char, f'\\{char}')
+    text = text.translate(_MD_ESCAPE_TABLE)
 
     # Limit length
     max_length = 100
@@ -126,22 +273,3 @@ def sanitize_for_embed(text: str) -> str:
         text = text[:max_length - 3] + '...'
 
     return text
-
-
-def calculate_required_votes(
-    voice_client: Optional[discord.VoiceClient]
-) -> int:
-    """
-    Calculate required votes to skip based on voice channel members.
-
-    Args:
-        voice_client: Discord voice client
-
-    Returns:
-        Number of votes required (majority + 1)
-    """
-    if not voice_client or not voice_client.channel:
-        return 1
-
-    members = [m for m in voice_client.channel.members if not m.bot]
-    return max(1, (len(members) // 2) + 1)
@@ -4,74 +4,285 @@ Song extraction from YouTube.
 Handles YouTube URL and search query processing using yt-dlp.
 """
 
+import concurrent.futures
+import importlib
+import multiprocessing
+from concurrent.futures.process import BrokenProcessPool
 from typing import Optional, Dict, Any, List
 
 from .config import (
-    YTDL_FORMAT_OPTIONS,
+    EXTRACTOR_WORKERS,
+    YTDL_FLAT_OPTIONS,
+    YTDL_STREAM_OPTIONS,
     MAX_QUEUE_DISPLAY,
     create_ytdl_instance,
     logger
 )
-import yt_dlp as yt_dlp_module
+from .audio_source import sanitize_title
+from .metadata_cache import (
+    cache_extraction,
+    get_cached_extraction,
+    normalize_query
+)
 
 
-async def extract_song_info(
-    query: str,
-    loop
-) -> tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+# Worker processes for yt-dlp, created on first use. Extraction (player
+# JS deciphering in particular) is CPU-heavy, so running it in separate
+# interpreters keeps it from contending with the event loop for the GIL.
+_extractor_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+# Per-worker-process yt-dlp instances (keyed by playlist mode), built on
+# first use and reused after that. Each worker runs one task at a time.
+_worker_ytdl: Dict[bool, Any] = {}
+
+# Set once yt-dlp has been reloaded after an import error in this process
+_ytdl_reloaded = False
+
+# Playlist URLs are listed flat in a single request and cut off at the
+# number of songs queued from one playlist
+_PLAYLIST_OPTIONS = {
+    **YTDL_FLAT_OPTIONS,
+    'playlistend': MAX_QUEUE_DISPLAY,
+}
+
+
+# Queries starting with one of these are treated as URLs, not searches
+_URL_PREFIXES = ('http://', 'https://', 'www.')
+
+
+class ExtractionError(Exception):
+    """yt-dlp failure carried back from an extractor worker process."""
+
+
+def _get_extractor_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """Return the extractor process pool, creating it if needed."""
+    global _extractor_pool
+    if _extractor_pool is None:
+        # Spawn rather than fork: the bot process runs threads (voice,
+        # executors) that are not safe to fork
+        _extractor_pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=EXTRACTOR_WORKERS,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    return _extractor_pool
+
+
+def shutdown_extractor_pool() -> None:
+    """Shut down the extractor process pool if it was started."""
+    global _extractor_pool
+    if _extractor_pool is not None:
+        _extractor_pool.shutdown(wait=False, cancel_futures=True)
+        _extractor_pool = None
+
+
+async def _run_extract(query: str, loop) -> Optional[Dict[str, Any]]:
     """
-    Extract song information from YouTube URL or search query.
+    Run _blocking_extract for query in the extractor process pool.
 
-    Handles both direct URLs and search queries. For search queries,
-    uses ytsearch: prefix for better results.
+    A worker that dies (OOM kill, crash) leaves the whole pool broken, so
+    a broken pool is replaced and the extraction retried once.
 
     Args:
         query: YouTube URL or search query
         loop: Event loop for executor
 
     Returns:
-        Tuple of (primary song info, list of additional songs for queue)
-        Returns (None, []) if not found
+        Sanitized yt-dlp info dict, or None if nothing was found
 
     Raises:
-        Exception: If extraction fails
+        ExtractionError: If extraction fails
     """
-    additional_songs: List[Dict[str, Any]] = []
+    pool = _get_extractor_pool()
+    try:
+        return await loop.run_in_executor(pool, _blocking_extract, query)
+    except BrokenProcessPool:
+        logger.warning("Extractor pool is broken, restarting it")
+        # Concurrent callers may have replaced it already
+        if _extractor_pool is pool:
+            shutdown_extractor_pool()
+        return await loop.run_in_executor(
+            _get_extractor_pool(),
+            _blocking_extract,
+            query
+        )
 
-    def extract_func():
-        """Extract video info using yt-dlp."""
-        # Create fresh instance for thread safety
-        ytdl = create_ytdl_instance()
 
-        try:
-            # Check if it's a URL
-            is_url = any(
-                query.startswith(prefix)
-                for prefix in ['http://', 'https://', 'www.']
-            )
+def _worker_extract(url: str, playlist: bool) -> Optional[Dict[str, Any]]:
+    """
+    Run one yt-dlp extraction with this worker's cached instance.
+
+    Args:
+        url: URL or ytsearch: query to extract
+        playlist: Use the flat, truncated playlist options
+
+    Returns:
+        Raw yt-dlp info dict, or None if nothing was found
 
-            # Add ytsearch prefix for non-URL queries
-            search_query = query if is_url else f"ytsearch:{query}"
-            return ytdl.extract_info(search_query, download=False)
+    Raises:
+        ExtractionError: If extraction fails
+    """
+    options = _PLAYLIST_OPTIONS if playlist else YTDL_STREAM_OPTIONS
+    try:
+        try:
+            ytdl = _worker_ytdl.get(playlist)
+            if ytdl is None:
+                ytdl = _worker_ytdl[playlist] = create_ytdl_instance(options)
+            return ytdl.extract_info(url, download=False)
         except Exception as e:
             # Handle yt-dlp import errors with retry
             error_str = str(e)
             has_circular = 'circular import' in error_str
             has_ejs = '_EJS_WIKI_URL' in error_str
 
-            if has_circular or has_ejs:
-                logger.warning(
-                    f"yt-dlp import error, retrying: {e}"
-                )
-                # Retry with fresh yt-dlp instance
-                import importlib
+            if not (has_circular or has_ejs):
+                raise
+            logger.warning(f"yt-dlp import error, retrying: {e}")
+            # Retry with fresh yt-dlp instance. Reloading re-executes the
+            # whole package, so it is done at most once per process.
+            global _ytdl_reloaded
+            import yt_dlp as yt_dlp_module
+            if not _ytdl_reloaded:
                 importlib.reload(yt_dlp_module)
-                fresh_ytdl = yt_dlp_module.YoutubeDL(YTDL_FORMAT_OPTIONS)
-                search_query = query if is_url else f"ytsearch:{query}"
-                return fresh_ytdl.extract_info(search_query, download=False)
-            raise
+                _ytdl_reloaded = True
+            ytdl = _worker_ytdl[playlist] = yt_dlp_module.YoutubeDL(options)
+            return ytdl.extract_info(url, download=False)
+    except Exception as e:
+        # yt-dlp exceptions hold references that cannot be pickled, so
+        # only the message crosses the process boundary
+        raise ExtractionError(str(e)) from None
+
+
+def _blocking_extract(query: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract video info using yt-dlp.
+
+    Runs inside an extractor worker process, so it must stay a top-level
+    function and return only picklable data.
+
+    Playlist URLs are listed flat, so their entries are lightweight URL
+    references (`_type` 'url'); only the first entry is fully extracted.
+
+    Args:
+        query: YouTube URL or search query
+
+    Returns:
+        Sanitized yt-dlp info dict, or None if nothing was found
+
+    Raises:
+        ExtractionError: If extraction fails
+    """
+    # Check if it's a URL
+    is_url = query.startswith(_URL_PREFIXES)
+
+    # Add ytsearch prefix for non-URL queries
+    search_query = query if is_url else f"ytsearch:{query}"
+
+    data = _worker_extract(search_query, playlist=is_url)
+    if not data:
+        return None
+
+    entries = data.get('entries')
+    if is_url and entries:
+        first = entries[0]
+        if first and first.get('_type') == 'url':
+            # The first entry plays right away, so resolve it here
+            entries[0] = _worker_extract(
+                first.get('url') or first.get('webpage_url'),
+                playlist=False
+            )
+
+    # Strip anything that cannot be pickled back to the bot process
+    return _worker_ytdl[is_url].sanitize_info(data)
+
+
+async def resolve_song(song: Dict[str, Any], loop) -> Dict[str, Any]:
+    """
+    Get the full extraction data for a queue entry.
+
+    Entries that only hold a flat playlist reference are extracted and
+    the result is stored on the entry as `_full_data`.
+
+    Args:
+        song: Queue entry dictionary
+        loop: Event loop for executor
+
+    Returns:
+        Full yt-dlp info dict for the entry
+
+    Raises:
+        ExtractionError: If extraction fails
+        ValueError: If the entry has no URL or nothing was found
+    """
+    data = song.get('_full_data')
+    if data:
+        return data
+
+    url = song.get('webpage_url') or song.get('url')
+    if not url:
+        raise ValueError(f"No URL for {song.get('title', 'Unknown')}")
+
+    cache_key = f'info:{normalize_query(url)}'
+    data = get_cached_extraction(cache_key)
+    if data is None:
+        data = await _run_extract(url, loop)
+        if not data:
+            raise ValueError(f"No results for {url}")
+        cache_extraction(cache_key, data)
+
+    song['_full_data'] = data
+    return data
+
+
+def _entry_to_song(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a queue entry from a playlist entry.
+
+    Args:
+        entry: Entry from a yt-dlp playlist result
 
-    data = await loop.run_in_executor(None, extract_func)
+    Returns:
+        Song dict ready to be queued
+    """
+    title = entry.get('title', 'Unknown')
+    return {
+        'title': title,
+        '_safe_title': sanitize_title(title),
+        'url': entry.get('url') or entry.get('webpage_url', ''),
+        'thumbnail': entry.get('thumbnail'),
+        # Flat playlist entries are resolved before they play; anything
+        # else is already fully extracted
+        '_full_data': None if entry.get('_type') == 'url' else entry
+    }
+
+
+async def extract_song_info(
+    query: str,
+    loop
+) -> tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Extract song information from YouTube URL or search query.
+
+    Handles both direct URLs and search queries. For search queries,
+    uses ytsearch: prefix for better results.
+
+    Args:
+        query: YouTube URL or search query
+        loop: Event loop for executor
+
+    Returns:
+        Tuple of (primary song info, list of additional songs for queue)
+        Returns (None, []) if not found
+
+    Raises:
+        ExtractionError: If extraction fails
+    """
+    # Repeated queries within the cache TTL skip yt-dlp entirely
+    cache_key = f'info:{normalize_query(query)}'
+    data = get_cached_extraction(cache_key)
+    if data is None:
+        data = await _run_extract(query, loop)
+        if data:
+            cache_extraction(cache_key, data)
 
     if not data:
         return None, []
@@ -82,18 +293,16 @@ async def extract_song_info(
         if not entries:
             return None, []
 
-        if len(entries) > 1:
+        # Only playlist URLs queue their other entries; extra search
+        # hits are alternatives, not songs the user asked for
+        if len(entries) > 1 and query.startswith(_URL_PREFIXES):
             # Multiple results - return first one, collect others
-            song = entries[0]
-            for entry in entries[1:MAX_QUEUE_DISPLAY]:
-                if entry:
-                    entry_url = entry.get('url', entry.get('webpage_url', ''))
-                    additional_songs.append({
-                        'title': entry.get('title', 'Unknown'),
-                        'url': entry_url,
-                        'thumbnail': entry.get('thumbnail')
-                    })
-            return song, additional_songs
+            additional_songs = [
+                _entry_to_song(entry)
+                for entry in entries[1:MAX_QUEUE_DISPLAY]
+                if entry
+            ]
+            return entries[0], additional_songs
         else:
             return entries[0] if entries else None, []
     else:
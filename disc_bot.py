@@ -12,11 +12,13 @@ Requirements:
 
 import discord
 from discord.ext import commands
+import asyncio
 import os
 import sys
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 
 # ============================================================================
@@ -51,111 +53,237 @@ intents.voice_states = True
 # Initialize bot
 bot = commands.Bot(command_prefix=COMMAND_PREFIX, intents=intents)
 
+# Error replies of the same type to the same channel within this window
+# (seconds) are combined into one message
+ERROR_BATCH_WINDOW = 0.25
+
+# (channel ID, error type) -> messages waiting for the batch to flush
+_pending_errors: Dict[Tuple[int, str], List[str]] = {}
+
+# In-flight batched error sends; the event loop only keeps weak
+# references to tasks, so they are held here until they finish
+_error_send_tasks: Set[asyncio.Task] = set()
+
+# Error reply templates, filled in per error with str.format
+_MISSING_ARG_MSG = (
+    '❌ Missing required argument: `{}`\n'
+    f'Use `{COMMAND_PREFIX}help {{}}` for usage information.'
+)
+_COOLDOWN_MSG = '⏳ Command is on cooldown. Try again in {:.1f}s'
+_MISSING_PERMS_MSG = (
+    '❌ You don\'t have permission to use this command.\n'
+    'Missing permissions: {}'
+)
+_UNEXPECTED_ERROR_MSG = (
+    '❌ An error occurred: {}\n'
+    'Please try again or contact an administrator.'
+)
+
+# Cog extensions to load, resolved once at import. Only music.py is a cog;
+# the other modules in cogs/ are its helpers.
+COGS_DIR = Path(__file__).parent / 'cogs'
+_COGS_TO_LOAD = [
+    f'cogs.{cog_name}'
+    for cog_name in ('music',)
+    if (COGS_DIR / f'{cog_name}.py').exists()
+]
+
 
 # ============================================================================
 # BOT EVENTS
 # ============================================================================
 
+@bot.event
+async def setup_hook() -> None:
+    """
+    Called once before the bot connects to Discord.
+
+    Loads all cogs from the cogs directory. Unlike on_ready, this does not
+    run again on gateway reconnects.
+    """
+    if not _COGS_TO_LOAD:
+        logger.warning(f'No cogs found in: {COGS_DIR}')
+        return
+
+    loaded_count = 0
+    failed_count = 0
+
+    for extension in _COGS_TO_LOAD:
+        try:
+            await bot.load_extension(extension)
+            logger.info(f'Loaded cog: {extension}')
+            loaded_count += 1
+        except Exception as e:
+            logger.error(f'Failed to load cog {extension}: {e}')
+            failed_count += 1
+
+    logger.info(f'Loaded {loaded_count} cog(s), {failed_count} failed')
+
+
 @bot.event
 async def on_ready() -> None:
     """
     Called when the bot successfully connects to Discord.
 
-    Loads all cogs from the cogs directory and prints connection status.
+    Prints connection status. May run again after a gateway reconnect.
     """
     logger.info(f'{bot.user} has connected to Discord!')
     logger.info(f'Bot is in {len(bot.guilds)} guild(s)')
     logger.info(f'Command prefix: {COMMAND_PREFIX}')
 
-    # Load only the main music cog (not helper modules)
-    cogs_dir = Path(__file__).parent / 'cogs'
-    # Only load music.py as a cog, not the helper modules
-    main_cogs = ['music']
-
-    if cogs_dir.exists():
-        loaded_count = 0
-        failed_count = 0
-
-        for cog_name in main_cogs:
-            cog_file = cogs_dir / f'{cog_name}.py'
-            if cog_file.exists():
-                try:
-                    await bot.load_extension(f'cogs.{cog_name}')
-                    logger.info(f'Loaded cog: {cog_name}')
-                    loaded_count += 1
-                except Exception as e:
-                    logger.error(f'Failed to load cog {cog_name}: {e}')
-                    failed_count += 1
 
-        logger.info(f'Loaded {loaded_count} cog(s), {failed_count} failed')
-    else:
-        logger.warning(f'Cogs directory not found: {cogs_dir}')
-
-
-@bot.event
-async def on_command_error(ctx: commands.Context, error: Exception) -> None:
+def send_error_reply(
+    ctx: commands.Context,
+    error_type: str,
+    message: str
+) -> None:
     """
-    Global error handler for all commands.
+    Queue an error reply, batching it with others of the same type.
 
-    Handles common command errors and provides user-friendly messages.
-    Ignores command not found errors (user typos).
+    The first error of a type opens an ERROR_BATCH_WINDOW batch for the
+    channel; identical messages within the window are sent only once.
 
     Args:
         ctx: Command context
-        error: Exception that occurred
+        error_type: Error class name used to group replies
+        message: Reply text
     """
-    # Ignore command not found errors (user typos)
-    if isinstance(error, commands.CommandNotFound):
+    key = (ctx.channel.id, error_type)
+    pending = _pending_errors.get(key)
+    if pending is not None:
+        if message not in pending:
+            pending.append(message)
         return
 
-    # Handle missing required arguments
-    if isinstance(error, commands.MissingRequiredArgument):
-        param_name = error.param.name
-        await ctx.send(
-            f'❌ Missing required argument: `{param_name}`\n'
-            f'Use `{COMMAND_PREFIX}help {ctx.command}` for usage information.'
-        )
-        return
+    _pending_errors[key] = [message]
+    bot.loop.call_later(ERROR_BATCH_WINDOW, _flush_errors, key, ctx.channel)
 
-    # Handle command cooldowns
-    if isinstance(error, commands.CommandOnCooldown):
-        retry_after = error.retry_after
-        await ctx.send(
-            f'⏳ Command is on cooldown. Try again in {retry_after:.1f}s'
-        )
-        return
 
-    # Handle permission errors
-    if isinstance(error, commands.MissingPermissions):
-        missing_perms = ', '.join(error.missing_permissions)
-        await ctx.send(
-            f'❌ You don\'t have permission to use this command.\n'
-            f'Missing permissions: {missing_perms}'
-        )
-        return
+def _flush_errors(
+    key: Tuple[int, str],
+    channel: discord.abc.Messageable
+) -> None:
+    """Send the batched error replies for key as one message."""
+    messages = _pending_errors.pop(key, None)
+    if messages:
+        # Discord rejects messages over 2000 characters
+        task = bot.loop.create_task(channel.send('\n'.join(messages)[:2000]))
+        _error_send_tasks.add(task)
+        task.add_done_callback(_on_error_reply_sent)
+
 
-    # Handle check failures (e.g., channel restrictions)
-    if isinstance(error, commands.CheckFailure):
-        # Let cog handle its own check failures
+def _on_error_reply_sent(task: asyncio.Task) -> None:
+    """Release a finished error send, logging it if it failed."""
+    _error_send_tasks.discard(task)
+    if task.cancelled():
         return
+    error = task.exception()
+    if error is not None:
+        logger.warning(f'Failed to send error reply: {error}')
+
+
+def _ignore_error(ctx: commands.Context, error: Exception) -> None:
+    """Drop an error that needs no reply."""
+
+
+def _reply_missing_argument(
+    ctx: commands.Context,
+    error: commands.MissingRequiredArgument
+) -> None:
+    """Reply to a command invoked without a required argument."""
+    send_error_reply(
+        ctx,
+        type(error).__name__,
+        _MISSING_ARG_MSG.format(error.param.name, ctx.command)
+    )
+
 
-    # Log and notify about other errors
+def _reply_cooldown(
+    ctx: commands.Context,
+    error: commands.CommandOnCooldown
+) -> None:
+    """Reply to a command used while on cooldown."""
+    send_error_reply(
+        ctx,
+        type(error).__name__,
+        _COOLDOWN_MSG.format(error.retry_after)
+    )
+
+
+def _reply_missing_permissions(
+    ctx: commands.Context,
+    error: commands.MissingPermissions
+) -> None:
+    """Reply to a command the user lacks permissions for."""
+    missing_perms = ', '.join(error.missing_permissions)
+    send_error_reply(
+        ctx,
+        type(error).__name__,
+        _MISSING_PERMS_MSG.format(missing_perms)
+    )
+
+
+def _reply_unexpected(ctx: commands.Context, error: Exception) -> None:
+    """Log and notify about an error with no specific handler."""
     error_type = type(error).__name__
     logger.error(f'Error in command {ctx.command}: {error_type}: {error}')
-    await ctx.send(
-        f'❌ An error occurred: {error_type}\n'
-        'Please try again or contact an administrator.'
-    )
+    send_error_reply(ctx, error_type, _UNEXPECTED_ERROR_MSG.format(error_type))
+
+
+# Error class -> handler. Subclasses of these are matched through their
+# MRO, so the most specific entry wins (e.g. MissingPermissions before
+# its base CheckFailure).
+_ERROR_HANDLERS: Dict[
+    type, Callable[[commands.Context, Exception], None]
+] = {
+    # Ignore command not found errors (user typos)
+    commands.CommandNotFound: _ignore_error,
+    commands.MissingRequiredArgument: _reply_missing_argument,
+    commands.CommandOnCooldown: _reply_cooldown,
+    commands.MissingPermissions: _reply_missing_permissions,
+    # Let cogs handle their own check failures (e.g. channel restrictions)
+    commands.CheckFailure: _ignore_error,
+}
+
+
+@bot.event
+async def on_command_error(ctx: commands.Context, error: Exception) -> None:
+    """
+    Global error handler for all commands.
+
+    Handles common command errors and provides user-friendly messages,
+    batched per channel by send_error_reply. Ignores command not found
+    errors (user typos).
+
+    Args:
+        ctx: Command context
+        error: Exception that occurred
+    """
+    handler = _ERROR_HANDLERS.get(type(error))
+    if handler is None:
+        # Subclass of a handled error, or an unexpected one
+        handler = next(
+            (
+                _ERROR_HANDLERS[cls]
+                for cls in type(error).__mro__
+                if cls in _ERROR_HANDLERS
+            ),
+            _reply_unexpected
+        )
+    handler(ctx, error)
 
 
 # ============================================================================
 # MAIN ENTRY POINT
 # ============================================================================
 
+@lru_cache(maxsize=1)
 def get_token() -> Optional[str]:
     """
     Get Discord bot token from environment variable.
 
+    The value is read once and cached for later callers.
+
     Returns:
         Bot token string or None if not set
     """
@@ -192,8 +320,9 @@ def main() -> None:
         print_setup_instructions()
         sys.exit(1)
 
-    # Validate token format (basic check)
-    if len(token) < 50:  # Discord tokens are typically 59+ characters
+    # Validate token format (basic check), only when asked for
+    verbose = os.getenv('DISCORD_TOKEN_VERBOSE')
+    if verbose and len(token) < 50:  # Tokens are typically 59+ characters
         logger.warning(
             'Token seems too short. Discord bot tokens are typically 59+ '
             'characters. Please verify it\'s correct.'